@@ -0,0 +1,173 @@
+"""
+Banc d'essai du moteur : recherche d'un ensemble fixe de positions à des profondeurs fixes.
+Pour chaque position sont mesurés le nombre de nœuds, le temps et la vitesse (nœuds par seconde), ainsi que le coup
+choisi. Les nombres de nœuds sont déterministes : leur total sert de signature du comportement de la recherche.
+
+    python bench.py                                  # affiche les résultats
+    python bench.py --output bench.json              # enregistre les résultats en JSON
+    python bench.py --compare bench.json             # compare à des résultats enregistrés
+    python bench.py --workers 1 2 4                  # temps pour atteindre chaque profondeur selon le nombre de
+                                                     # processus de la recherche parallèle (Lazy SMP)
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+import chess
+
+import engine
+
+# Positions de référence (FEN) et profondeur de recherche de chacune
+BENCH_POSITIONS = [
+    ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", 5),
+    ("r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3", 5),
+    ("r1bqk2r/pppp1ppp/2n2n2/2b1p3/2B1P3/3P1N2/PPP2PPP/RNBQK2R w KQkq - 1 5", 5),
+    ("rnbqkb1r/pp2pppp/3p1n2/8/3NP3/8/PPP2PPP/RNBQKB1R w KQkq - 1 5", 5),
+    ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", 4),
+    ("2r2rk1/pp1bqppp/2n1pn2/3p4/3P4/2PBPN2/P2Q1PPP/R4RK1 b - - 3 14", 4),
+    ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", 6),
+    ("8/5pk1/6p1/8/3R4/6P1/5PK1/4r3 b - - 0 40", 6),
+]
+
+NPS_TOLERANCE = 0.05  # Baisse relative de vitesse au-delà de laquelle une régression est signalée
+
+
+def run_bench(positions=BENCH_POSITIONS):
+    """
+    Fonction recherchant chaque position de référence dans des conditions reproductibles : table de transposition
+    et historique vidés, ni bibliothèque d'ouvertures, ni tables de finales, recherche dans un seul processus
+    :param positions: Liste de couples (FEN, profondeur)
+    :return: Dictionnaire des résultats (par position et totaux)
+    """
+    engine.OPENING_BOOK = False
+    engine.SYZYGY = False
+    engine.SEARCH_WORKERS = 1
+
+    results = []
+    for fen, depth in positions:
+        board = chess.Board(fen)
+        engine.TRANSPOSITION_TABLE.clear()
+        engine.clear_move_ordering()
+
+        start = time.perf_counter()
+        value, move, _ = engine.iterative_deepening(board, board.turn, depth)
+        elapsed = time.perf_counter() - start
+
+        nodes = engine.search_stats.nodes
+        results.append({"fen": fen, "depth": depth, "nodes": nodes, "time": elapsed, "nps": nodes / elapsed,
+                        "move": move.uci(), "score": value})
+
+    total_nodes = sum(result["nodes"] for result in results)
+    total_time = sum(result["time"] for result in results)
+    return {"python": platform.python_version(), "chess": chess.__version__, "positions": results,
+            "nodes": total_nodes, "time": total_time, "nps": total_nodes / total_time}
+
+
+def run_workers_bench(worker_counts, positions=BENCH_POSITIONS):
+    """
+    Fonction mesurant, pour chaque nombre de processus, le temps nécessaire pour atteindre la profondeur de chaque
+    position de référence (mêmes conditions que run_bench)
+    :param worker_counts: Nombres de processus à comparer
+    :param positions: Liste de couples (FEN, profondeur)
+    :return: Dictionnaire {nombre de processus: temps total en secondes}
+    """
+    engine.OPENING_BOOK = False
+    engine.SYZYGY = False
+
+    timings = dict.fromkeys(worker_counts, 0.0)
+    for fen, depth in positions:
+        for workers, elapsed in engine.benchmark_parallel_search([chess.Board(fen)], depth, worker_counts).items():
+            timings[workers] += elapsed
+    return timings
+
+
+def compare(results, baseline, tolerance=NPS_TOLERANCE):
+    """
+    Fonction comparant des résultats à des résultats de référence
+    :param results: Résultats renvoyés par run_bench
+    :param baseline: Résultats de référence (même format)
+    :param tolerance: Baisse relative de vitesse tolérée
+    :return: Liste des différences constatées (vide si aucune régression)
+    """
+    problems = []
+
+    # Un nombre de nœuds ou un coup différent signifie que la recherche ne parcourt plus le même arbre
+    reference = {(entry["fen"], entry["depth"]): entry for entry in baseline["positions"]}
+    for entry in results["positions"]:
+        previous = reference.get((entry["fen"], entry["depth"]))
+        if previous is None:
+            continue
+        if entry["nodes"] != previous["nodes"]:
+            problems.append("nodes changed for %s (depth %d): %d -> %d"
+                            % (entry["fen"], entry["depth"], previous["nodes"], entry["nodes"]))
+        if entry["move"] != previous["move"]:
+            problems.append("move changed for %s (depth %d): %s -> %s"
+                            % (entry["fen"], entry["depth"], previous["move"], entry["move"]))
+
+    if results["nps"] < baseline["nps"] * (1 - tolerance):
+        problems.append("nps regression: %d -> %d (%+.1f %%)"
+                        % (baseline["nps"], results["nps"], 100 * (results["nps"] / baseline["nps"] - 1)))
+
+    return problems
+
+
+def print_results(results, baseline=None):
+    # Fonction affichant les résultats position par position, et l'écart avec la référence si elle est fournie
+    for entry in results["positions"]:
+        print("%-72s d%-2d %9d nodes %7.3f s %8d nps  %s"
+              % (entry["fen"], entry["depth"], entry["nodes"], entry["time"], entry["nps"], entry["move"]))
+    print("Total: %d nodes, %.3f s, %d nps" % (results["nodes"], results["time"], results["nps"]))
+    if baseline is not None:
+        print("Baseline: %d nodes, %.3f s, %d nps (%+.1f %%)"
+              % (baseline["nodes"], baseline["time"], baseline["nps"], 100 * (results["nps"] / baseline["nps"] - 1)))
+
+
+def print_workers_results(timings):
+    # Fonction affichant le temps total et l'accélération par rapport au premier nombre de processus mesuré
+    reference = next(iter(timings.values()))
+    for workers, elapsed in timings.items():
+        print("%2d worker(s): %7.3f s  x%.2f" % (workers, elapsed, reference / elapsed))
+
+
+def main():
+    # Fonction lançant le banc d'essai depuis la ligne de commande, le code de retour vaut 1 en cas de régression
+    parser = argparse.ArgumentParser(description="Reproducible benchmark of the minimax engine")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare the results with this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=NPS_TOLERANCE,
+                        help="relative nps drop reported as a regression (default: %(default)s)")
+    parser.add_argument("--workers", type=int, nargs="+", metavar="N",
+                        help="measure the time to depth with each number of Lazy SMP processes instead")
+    args = parser.parse_args()
+
+    if args.workers:
+        print_workers_results(run_workers_bench(args.workers))
+        return 0
+
+    results = run_bench()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if baseline is not None:
+        problems = compare(results, baseline, args.tolerance)
+        for problem in problems:
+            print("REGRESSION:", problem)
+        return 1 if problems else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
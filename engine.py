@@ -0,0 +1,1340 @@
+"""
+Moteur de jeu de l'ordinateur : évaluation des positions, recherche minimax et choix du coup à jouer.
+Ce module n'utilise pas pygame et n'a aucun effet de bord à l'importation : il peut être chargé sans affichage,
+dans un banc d'essai ou dans un processus de recherche.
+"""
+
+import time
+import json
+import threading
+import random
+import struct
+import os
+import atexit
+import multiprocessing
+import queue
+from multiprocessing import shared_memory
+from concurrent.futures import ThreadPoolExecutor
+from traceback import format_exc
+
+import chess
+import chess.polyglot
+import chess.syzygy
+
+
+# ----------------------------------------------- Algorithme de jeux  ----------------------------------------------- #
+def make_random_AI_move(board):
+    # Fonction permettant à l'IA de jouer des coups aléatoires
+
+    legal_moves = list(board.legal_moves)  # Liste de coups légaux
+
+    if not legal_moves:  # S'il n'y a pas de coup, c'est sûrement qu'il y a échec et mat ou égalité
+        return board
+
+    # Choix d'un coup aléatoire
+    random_move = random.choice(legal_moves)
+
+    # Création d'une copie de l'état actuel de l'échiquier
+    new_board = board.copy()
+
+    # Joue le coup aléatoire
+    new_board.push(random_move)
+
+    return new_board
+
+
+PIECES_VALUES = {
+    chess.PAWN: 1,
+    chess.KNIGHT: 3,
+    chess.BISHOP: 3,
+    chess.ROOK: 5,
+    chess.QUEEN: 9
+}
+
+development_coefficients = {
+    chess.PAWN: 2,
+    chess.KNIGHT: 0.5,
+    chess.BISHOP: 0.5,
+    chess.ROOK: 0.15,
+    chess.QUEEN: 0.1
+}
+
+
+# Masques précalculés pour l'évaluation par bitboards
+BB_CENTER = int(chess.SquareSet([chess.C4, chess.D4, chess.E4, chess.C5, chess.D5, chess.E5]))
+
+# Colonnes adjacentes à chaque colonne de l'échiquier
+BB_ADJACENT_FILES = [(chess.BB_FILES[file - 1] if file > 0 else 0) | (chess.BB_FILES[file + 1] if file < 7 else 0)
+                     for file in range(8)]
+
+# Rangées de développement de chaque couleur, associées au multiplicateur (7 - rangée) du bonus de développement
+DEVELOPMENT_RANKS = {
+    chess.WHITE: [(chess.BB_RANK_1, 7), (chess.BB_RANK_2, 6)],
+    chess.BLACK: [(chess.BB_RANK_7, 1), (chess.BB_RANK_8, 0)]
+}
+
+
+def supported_pawns(pawns):
+    """
+    Fonction calculant l'ensemble des pions ayant un pion de même couleur sur une case adjacente de la même rangée
+    :param pawns: Bitboard des pions d'une couleur
+    :return: Bitboard des pions supportés
+    """
+    return pawns & (((pawns << 1) & ~chess.BB_FILE_A) | ((pawns >> 1) & ~chess.BB_FILE_H)) & chess.BB_ALL
+
+
+def is_pawn_supported(board, square, color):
+    """
+    Fonction vérifiant si le pion à une case donnée est supporté par un autre pion de même couleur
+    :param board: État actuel de l'échiquier
+    :param square: Case où se trouve le pion
+    :param color: Couleur du pion
+    :return: Vrai si le pion est supporté, faux sinon
+    """
+
+    # Pions de même couleur sur les colonnes adjacentes de la même rangée
+    neighbours = BB_ADJACENT_FILES[chess.square_file(square)] & chess.BB_RANKS[chess.square_rank(square)]
+    return bool(board.pieces_mask(chess.PAWN, color) & neighbours)
+
+
+def evaluate_board(board, color):
+    """
+    Fonction heuristique permettant l'évaluation de l'état actuel d'un échiquier
+    :param board: État actuel de l'échiquier
+    :param color: Couleur du joueur actuel
+    :return: Score total d'évaluation de l'état actuel de l'échiquier
+    """
+
+    total_score = 0
+
+    # Valeurs et coefficients des pièces en fonction de la couleur du joueur actuel
+    values = PIECES_VALUES
+    coeff = development_coefficients
+    own = board.occupied_co[color]
+    (first_rank, first_multiplier), (second_rank, second_multiplier) = DEVELOPMENT_RANKS[color]
+
+    # Matériel et valorisation du développement des pièces, type de pièce par type de pièce
+    for piece_type, pieces in ((chess.PAWN, board.pawns), (chess.KNIGHT, board.knights),
+                               (chess.BISHOP, board.bishops), (chess.ROOK, board.rooks), (chess.QUEEN, board.queens)):
+        pieces &= own
+        if pieces:
+            total_score += values[piece_type] * chess.popcount(pieces)
+            total_score += coeff[piece_type] * (first_multiplier * chess.popcount(pieces & first_rank)
+                                                + second_multiplier * chess.popcount(pieces & second_rank))
+
+    # Développement du roi et valorisation du roque
+    if board.kings & own & (first_rank | second_rank):
+        total_score -= 1
+        if board.has_kingside_castling_rights(color) or board.has_queenside_castling_rights(color):
+            total_score += 1
+
+    # Bonus pour les pions supportés et pénalité pour les pions isolés
+    pawns = board.pawns & own
+    total_score += 2 * chess.popcount(supported_pawns(pawns)) - chess.popcount(pawns)
+
+    # Contrôle du centre du plateau
+    total_score += 2 * chess.popcount(own & BB_CENTER) - chess.popcount(BB_CENTER)
+
+    # Défense du Roi
+    if not board.is_attacked_by(color, board.king(color)):
+        total_score += 1
+    else:
+        total_score -= 1
+
+    return total_score
+
+
+# --------------------------------------------- Évaluation incrémentale --------------------------------------------- #
+def build_piece_square_scores():
+    """
+    Fonction précalculant, pour chaque couleur, type de pièce et case, la part de l'évaluation qui ne dépend que de
+    la pièce et de sa case : valeur matérielle, bonus de développement et occupation du centre
+    :return: Dictionnaire {couleur: {type de pièce: liste des 64 scores}}
+    """
+    tables = {}
+    for color in chess.COLORS:
+        tables[color] = {}
+        for piece_type in chess.PIECE_TYPES:
+            scores = []
+            for square in chess.SQUARES:
+                score = PIECES_VALUES.get(piece_type, 0)
+
+                # Le développement du roi dépend des droits de roque, il est ajouté lors de l'évaluation
+                if piece_type != chess.KING and ((color == chess.WHITE and square < 16)
+                                                 or (color == chess.BLACK and square > 47)):
+                    score += development_coefficients[piece_type] * (7 - chess.square_rank(square))
+
+                # Une case centrale occupée par le joueur vaut +1 au lieu de -1
+                if BB_CENTER & chess.BB_SQUARES[square]:
+                    score += 2
+
+                scores.append(score)
+            tables[color][piece_type] = scores
+    return tables
+
+
+PIECE_SQUARE_SCORES = build_piece_square_scores()
+
+
+def piece_square_score(board, color):
+    # Fonction calculant entièrement la part « pièce-case » de l'évaluation (utilisée à la racine de la recherche)
+    tables = PIECE_SQUARE_SCORES[color]
+    total = 0
+    for piece_type in chess.PIECE_TYPES:
+        for square in board.pieces(piece_type, color):
+            total += tables[piece_type][square]
+    return total
+
+
+def pawn_structure_score(board, color):
+    # Fonction calculant le bonus (+1) ou la pénalité (-1) de chaque pion selon qu'il est soutenu ou isolé
+    pawns = board.pieces_mask(chess.PAWN, color)
+    return 2 * chess.popcount(supported_pawns(pawns)) - chess.popcount(pawns)
+
+
+def move_eval_delta(board, move, color):
+    """
+    Fonction calculant la variation de la part « pièce-case » de l'évaluation provoquée par un coup (avant de le jouer)
+    :param board: État actuel de l'échiquier
+    :param move: Coup sur le point d'être joué
+    :param color: Couleur évaluée
+    :return: Variation du score et booléen indiquant si la structure de pions de la couleur évaluée est modifiée
+    """
+    tables = PIECE_SQUARE_SCORES[color]
+
+    if board.turn == color:
+        # Déplacement (et éventuelle promotion) d'une pièce du joueur évalué
+        piece_type = board.piece_type_at(move.from_square)
+        delta = tables[move.promotion or piece_type][move.to_square] - tables[piece_type][move.from_square]
+
+        # Le roque déplace aussi la tour
+        if piece_type == chess.KING and board.is_castling(move):
+            rank = chess.square_rank(move.from_square)
+            if board.is_kingside_castling(move):
+                rook_from, rook_to = chess.square(7, rank), chess.square(5, rank)
+            else:
+                rook_from, rook_to = chess.square(0, rank), chess.square(3, rank)
+            delta += tables[chess.ROOK][rook_to] - tables[chess.ROOK][rook_from]
+
+        return delta, piece_type == chess.PAWN
+
+    # Capture éventuelle d'une pièce du joueur évalué par l'adversaire
+    if board.is_en_passant(move):
+        captured_square = chess.square(chess.square_file(move.to_square), chess.square_rank(move.from_square))
+        captured_type = chess.PAWN
+    else:
+        captured_square = move.to_square
+        captured_type = board.piece_type_at(captured_square)
+
+    if captured_type is None:
+        return 0, False
+    return -tables[captured_type][captured_square], captured_type == chess.PAWN
+
+
+def evaluate_incremental(board, color, piece_square, pawn_structure):
+    """
+    Fonction d'évaluation à partir des scores maintenus de manière incrémentale pendant la recherche.
+    Elle donne le même résultat que evaluate_board en ne recalculant que les termes dépendant du roi.
+    :param board: État actuel de l'échiquier
+    :param color: Couleur du joueur actuel
+    :param piece_square: Part « pièce-case » de l'évaluation (matériel, développement, centre)
+    :param pawn_structure: Score de la structure de pions
+    :return: Score total d'évaluation de l'état actuel de l'échiquier
+    """
+    total_score = piece_square + pawn_structure - chess.popcount(BB_CENTER)
+
+    king_square = board.king(color)
+
+    # Développement du roi et valorisation du roque
+    if (color == chess.WHITE and king_square < 16) or (color == chess.BLACK and king_square > 47):
+        total_score -= 1
+        if board.has_kingside_castling_rights(color) or board.has_queenside_castling_rights(color):
+            total_score += 1
+
+    # Défense du Roi
+    if not board.is_attacked_by(color, king_square):
+        total_score += 1
+    else:
+        total_score -= 1
+
+    return total_score
+
+
+# --------------------------------------------- Table de transposition ---------------------------------------------- #
+TT_SIZE_MB = 16  # Mémoire maximale allouée à la table de transposition (en Mo)
+
+# Types de borne associés au score stocké dans la table
+TT_EXACT = 0  # Score exact
+TT_LOWER = 1  # Borne inférieure (coupure bêta)
+TT_UPPER = 2  # Borne supérieure (aucun coup n'a dépassé alpha)
+
+# Clé mélangée à la clé de Zobrist quand l'ordinateur joue les noirs : l'évaluation dépend de la couleur évaluée
+TT_BLACK_KEY = 0x9D39247E33776D41
+
+# Format d'une entrée (24 octets) : clé de contrôle, données (profondeur, borne, coup, âge) et score.
+# La clé de contrôle est la clé de Zobrist combinée (xor) aux données et au score : une entrée écrite en même temps
+# par deux processus de la recherche parallèle ne correspond plus à sa clé et est simplement ignorée.
+TT_ENTRY = struct.Struct('<QQd')
+TT_SCORE_BITS = struct.Struct('<Q')  # Lecture des bits du score pour le calcul de la clé de contrôle
+TT_SCORE_OFFSET = 16
+
+
+def encode_move(move):
+    # Fonction encodant un coup sur 16 bits (case de départ, case d'arrivée et promotion), 0 pour l'absence de coup
+    if move is None:
+        return 0
+    return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+
+def decode_move(code):
+    # Fonction décodant un coup encodé par encode_move
+    if code == 0:
+        return None
+    return chess.Move(code & 0x3F, (code >> 6) & 0x3F, (code >> 12) or None)
+
+
+def tt_key(board, color):
+    # Fonction calculant la clé de l'échiquier dans la table de transposition selon la couleur de l'ordinateur
+    key = chess.polyglot.zobrist_hash(board)
+    return key ^ TT_BLACK_KEY if color == chess.BLACK else key
+
+
+class TranspositionTable:
+    """
+    Table de transposition de taille fixe indexée par la clé de Zobrist de l'échiquier.
+    Chaque case contient une seule entrée : elle est remplacée si elle provient d'une recherche précédente
+    ou si la nouvelle entrée a été calculée à une profondeur supérieure ou égale.
+    La table peut être placée dans un segment de mémoire partagée pour être utilisée par plusieurs processus.
+    """
+
+    def __init__(self, size_mb=TT_SIZE_MB, buffer=None):
+        """
+        :param size_mb: Mémoire maximale allouée à la table (en Mo)
+        :param buffer: Zone mémoire existante à utiliser (mémoire partagée), allouée si absente
+        """
+        if buffer is None:
+            self.size = max(1, (size_mb * 1024 * 1024) // TT_ENTRY.size)
+            self.data = bytearray(self.size * TT_ENTRY.size)
+        else:
+            self.size = len(buffer) // TT_ENTRY.size
+            self.data = buffer
+        self.age = 0
+
+    def clear(self):
+        # Vide entièrement la table
+        self.data[:] = bytes(len(self.data))
+        self.age = 0
+
+    def new_search(self):
+        # Signale le début d'une nouvelle recherche : les entrées précédentes deviennent remplaçables en priorité
+        self.age = (self.age + 1) & 0xFF
+
+    def probe(self, key):
+        """
+        Recherche une position dans la table
+        :param key: Clé de Zobrist de la position
+        :return: Tuple (profondeur, score, type de borne, meilleur coup) si la position est présente, None sinon
+        """
+        offset = (key % self.size) * TT_ENTRY.size
+        check, data, score = TT_ENTRY.unpack_from(self.data, offset)
+        depth = data & 0xFF
+        if depth == 0 or check ^ data ^ TT_SCORE_BITS.unpack_from(self.data, offset + TT_SCORE_OFFSET)[0] != key:
+            return None
+        return depth, score, (data >> 8) & 0xFF, decode_move((data >> 16) & 0xFFFF)
+
+    def store(self, key, depth, score, flag, move):
+        """
+        Enregistre le résultat de la recherche d'une position
+        :param key: Clé de Zobrist de la position
+        :param depth: Profondeur de la recherche
+        :param score: Score de la position
+        :param flag: Type de borne du score (TT_EXACT, TT_LOWER ou TT_UPPER)
+        :param move: Meilleur coup trouvé
+        """
+        offset = (key % self.size) * TT_ENTRY.size
+        check, data, _ = TT_ENTRY.unpack_from(self.data, offset)
+        entry_key = check ^ data ^ TT_SCORE_BITS.unpack_from(self.data, offset + TT_SCORE_OFFSET)[0]
+
+        # Politique de remplacement : on conserve l'entrée la plus profonde de la recherche en cours
+        if entry_key == key or (data >> 32) != self.age or depth >= (data & 0xFF):
+            data = depth | (flag << 8) | (encode_move(move) << 16) | (self.age << 32)
+            TT_ENTRY.pack_into(self.data, offset, 0, data, score)
+            score_bits = TT_SCORE_BITS.unpack_from(self.data, offset + TT_SCORE_OFFSET)[0]
+            TT_SCORE_BITS.pack_into(self.data, offset, key ^ data ^ score_bits)
+
+
+# Table de transposition partagée par toutes les recherches de l'ordinateur
+TRANSPOSITION_TABLE = TranspositionTable()
+
+# ------------------------------------------- Approfondissement itératif -------------------------------------------- #
+MAX_SEARCH_DEPTH = 20  # Profondeur maximale atteignable par l'approfondissement itératif
+
+# Score d'un échec et mat, diminué du nombre de demi-coups pour préférer le mat le plus rapide (le nombre de coups
+# avant le mat peut ainsi être retrouvé). Il dépasse le bonus des positions gagnées d'après les tables de finales
+# (TABLEBASE_WIN_SCORE) : un mat est toujours préféré
+MATE_SCORE = 10000
+
+
+def score_to_tt(score, ply):
+    """
+    Fonction convertissant un score de mat, mesuré depuis la racine de la recherche, en distance au mat depuis la
+    position elle-même avant de l'enregistrer dans la table de transposition : la position peut être retrouvée
+    à un autre demi-coup ou lors d'une recherche suivante
+    :param score: Score de la position
+    :param ply: Demi-coup de la position depuis la racine de la recherche
+    :return: Score à enregistrer dans la table
+    """
+    if score > MATE_SCORE - MAX_PLY:
+        return score + ply
+    if score < -(MATE_SCORE - MAX_PLY):
+        return score - ply
+    return score
+
+
+def score_from_tt(score, ply):
+    # Fonction inverse de score_to_tt : un score de mat lu dans la table est ramené à la racine de la recherche
+    if score > MATE_SCORE - MAX_PLY:
+        return score - ply
+    if score < -(MATE_SCORE - MAX_PLY):
+        return score + ply
+    return score
+
+search_deadline = None  # Instant (time.monotonic) auquel la recherche en cours doit s'interrompre
+search_stop = threading.Event()  # Événement signalant l'annulation de la recherche en cours
+
+
+class SearchTimeout(Exception):
+    # Exception levée lorsque le temps de réflexion alloué à la recherche est écoulé
+    pass
+
+
+class SearchStats:
+    """
+    Statistiques d'une recherche de l'ordinateur : travail effectué (nœuds, évaluations), efficacité de l'élagage
+    (coupures bêta, coupures dès le premier coup, facteur de branchement effectif par profondeur), utilisation de la
+    table de transposition et durée. Une instance est créée pour chaque recherche et renvoyée avec le coup joué.
+    """
+
+    def __init__(self):
+        self.nodes = 0  # Nœuds visités
+        self.leaf_evaluations = 0  # Positions évaluées (feuilles de l'arbre)
+        self.beta_cutoffs = 0  # Nœuds élagués après un coup dépassant la borne
+        self.first_move_cutoffs = 0  # Coupures obtenues dès le premier coup essayé
+        self.tt_probes = 0  # Consultations de la table de transposition
+        self.tt_hits = 0  # Consultations ayant trouvé la position
+        self.depth_nodes = []  # Nœuds cumulés à la fin de chaque profondeur terminée
+        self.depth = 0  # Dernière profondeur entièrement explorée
+        self.value = None  # Score du coup choisi
+        self.move = None  # Coup choisi
+        self.source = "search"  # Origine du coup : "search", "book" ou "tablebase"
+        self.start = time.monotonic()
+        self.elapsed = 0.0  # Durée de la recherche en secondes
+
+    def finish(self, value, move, source="search"):
+        # Enregistre le résultat et la durée de la recherche
+        self.value, self.move, self.source = value, move, source
+        self.elapsed = time.monotonic() - self.start
+
+    def add(self, other):
+        # Ajoute les compteurs d'une autre recherche (processus de la recherche parallèle)
+        self.nodes += other.nodes
+        self.leaf_evaluations += other.leaf_evaluations
+        self.beta_cutoffs += other.beta_cutoffs
+        self.first_move_cutoffs += other.first_move_cutoffs
+        self.tt_probes += other.tt_probes
+        self.tt_hits += other.tt_hits
+
+    def first_move_cutoff_rate(self):
+        # Part des coupures obtenues dès le premier coup (qualité de l'ordonnancement des coups)
+        return self.first_move_cutoffs / self.beta_cutoffs if self.beta_cutoffs else 0.0
+
+    def tt_hit_rate(self):
+        # Part des consultations de la table de transposition ayant trouvé la position
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    def nps(self):
+        # Nœuds visités par seconde
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def branching_factors(self):
+        """
+        Calcule le facteur de branchement effectif de chaque profondeur : rapport entre les nœuds visités par
+        l'itération de profondeur d et ceux de l'itération de profondeur d - 1
+        :return: Dictionnaire {profondeur: facteur de branchement effectif}
+        """
+        factors = {}
+        first_depth = self.depth - len(self.depth_nodes) + 1
+        previous = None
+        for i, cumulated in enumerate(self.depth_nodes):
+            iteration = cumulated - (self.depth_nodes[i - 1] if i > 0 else 0)
+            if previous:
+                factors[first_depth + i] = iteration / previous
+            previous = iteration
+        return factors
+
+    def as_dict(self):
+        # Statistiques sous forme de dictionnaire (export JSON)
+        return {"source": self.source, "move": self.move.uci() if self.move is not None else None,
+                "value": self.value, "depth": self.depth, "elapsed": self.elapsed, "nodes": self.nodes,
+                "nps": self.nps(), "leaf_evaluations": self.leaf_evaluations, "beta_cutoffs": self.beta_cutoffs,
+                "first_move_cutoff_rate": self.first_move_cutoff_rate(), "tt_probes": self.tt_probes,
+                "tt_hit_rate": self.tt_hit_rate(),
+                "branching_factors": {str(depth): factor for depth, factor in self.branching_factors().items()}}
+
+    def summary(self):
+        # Statistiques principales sous forme de lignes de texte (affichage dans la fenêtre)
+        if self.source != "search":
+            return ["%s : %s" % (self.source, self.move.uci() if self.move is not None else "-")]
+        factors = self.branching_factors()
+        return ["Profondeur %d en %.2f s" % (self.depth, self.elapsed),
+                "%d nœuds (%d n/s)" % (self.nodes, self.nps()),
+                "Coupures 1er coup : %.0f %%" % (100 * self.first_move_cutoff_rate()),
+                "Table de transposition : %.0f %%" % (100 * self.tt_hit_rate()),
+                "Branchement effectif : %.1f" % factors[self.depth] if self.depth in factors
+                else "Branchement effectif : -"]
+
+
+search_stats = SearchStats()  # Statistiques de la recherche en cours (ou de la dernière recherche)
+SEARCH_LOG_PATH = None  # Journal des statistiques des recherches (None pour ne rien enregistrer)
+
+
+def log_search_stats(stats, path=None):
+    """
+    Fonction ajoutant les statistiques d'une recherche au journal, une ligne JSON par recherche
+    :param stats: Statistiques de la recherche
+    :param path: Fichier du journal (SEARCH_LOG_PATH par défaut)
+    """
+    path = path if path is not None else SEARCH_LOG_PATH
+    if path is None:
+        return
+    with open(path, 'a') as log_file:
+        log_file.write(json.dumps(dict(stats.as_dict(), date=time.strftime('%x %X'))) + '\n')
+
+
+# Gestion du temps de réflexion de l'ordinateur
+MOVES_TO_GO = 30  # Nombre de coups que l'on estime rester à jouer dans la partie
+MOVE_OVERHEAD = 0.1  # Marge de sécurité (en secondes) pour jouer le coup et rafraîchir l'affichage
+MIN_MOVE_TIME = 0.05  # Temps de réflexion minimal (en secondes)
+
+
+def allocate_move_time(remaining, increment, initial_time=None):
+    """
+    Fonction calculant le temps de réflexion alloué à l'ordinateur pour son prochain coup
+    :param remaining: Temps restant à la pendule de l'ordinateur (en secondes)
+    :param increment: Incrémentation ajoutée après chaque coup (en secondes)
+    :param initial_time: Temps initial de la cadence choisie (en secondes), s'il est connu
+    :return: Temps de réflexion en secondes
+    """
+
+    # Part du temps restant répartie sur les coups à venir, plus l'essentiel de l'incrémentation
+    budget = remaining / MOVES_TO_GO + 0.75 * increment
+
+    # On ne consomme jamais plus d'un quart du temps restant, ni plus que ce que la cadence choisie justifie
+    budget = min(budget, remaining / 4)
+    if initial_time is not None:
+        budget = min(budget, initial_time / 10 + increment)
+
+    return max(MIN_MOVE_TIME, budget - MOVE_OVERHEAD)
+
+
+# -------------------------------------------- Ordonnancement des coups --------------------------------------------- #
+MAX_PLY = 64  # Nombre maximal de demi-coups suivis par les coups meurtriers
+
+# Deux coups meurtriers (coups calmes ayant provoqué une coupure) mémorisés par demi-coup
+killer_moves = [[None, None] for _ in range(MAX_PLY)]
+
+# Historique des coupures des coups calmes, indexé par couleur puis par (case de départ, case d'arrivée)
+history_table = {chess.WHITE: [0] * 4096, chess.BLACK: [0] * 4096}
+
+
+def clear_move_ordering():
+    # Fonction réinitialisant les coups meurtriers et atténuant l'historique avant une nouvelle recherche
+    for killers in killer_moves:
+        killers[0] = killers[1] = None
+
+    for history in history_table.values():
+        for i in range(4096):
+            history[i] //= 2
+
+
+def update_move_ordering(board, move, depth, ply):
+    """
+    Fonction mémorisant un coup calme ayant provoqué une coupure alpha-bêta
+    :param board: État actuel de l'échiquier (avant le coup)
+    :param move: Coup ayant provoqué la coupure
+    :param depth: Profondeur restante de la recherche
+    :param ply: Demi-coup courant depuis la racine
+    """
+    if board.is_capture(move) or move.promotion:
+        return
+
+    if ply < MAX_PLY and killer_moves[ply][0] != move:
+        killer_moves[ply][1] = killer_moves[ply][0]
+        killer_moves[ply][0] = move
+
+    history_table[board.turn][move.from_square * 64 + move.to_square] += depth * depth
+
+
+def order_moves(board, legal_moves, hash_move, ply):
+    """
+    Fonction triant les coups légaux pour provoquer les coupures alpha-bêta le plus tôt possible
+    :param board: État actuel de l'échiquier
+    :param legal_moves: Liste des coups légaux
+    :param hash_move: Meilleur coup trouvé par une recherche précédente (table de transposition)
+    :param ply: Demi-coup courant depuis la racine
+    :return: Liste des coups triés : coup de la table, captures (MVV-LVA), coups meurtriers puis coups calmes
+    """
+    killers = killer_moves[ply] if ply < MAX_PLY else (None, None)
+    history = history_table[board.turn]
+
+    def move_priority(move):
+        if move == hash_move:
+            return 3, 0
+
+        if board.is_capture(move):
+            # Victime la plus précieuse, attaquant le moins précieux (le roi ne peut capturer qu'une pièce non défendue)
+            victim = chess.PAWN if board.is_en_passant(move) else board.piece_type_at(move.to_square)
+            attacker = board.piece_type_at(move.from_square)
+            return 2, 10 * PIECES_VALUES[victim] - PIECES_VALUES.get(attacker, 0)
+
+        if move.promotion:
+            return 2, 10 * PIECES_VALUES[move.promotion] - PIECES_VALUES[chess.PAWN]
+
+        if move == killers[0]:
+            return 1, 1
+        if move == killers[1]:
+            return 1, 0
+
+        return 0, history[move.from_square * 64 + move.to_square]
+
+    return sorted(legal_moves, key=move_priority, reverse=True)
+
+
+def minimax_alpha_beta(board, color, depth, alpha, beta, maximizing_player, ply=0, eval_state=None):
+    """
+    Fonction d'évaluation minimax avec élagage alpha-bêta pour déterminer le meilleur coup à jouer
+    :param board: État actuel de l'échiquier
+    :param color: Couleur de l'ordinateur
+    :param depth: Profondeur de recherche de l'arbre de jeu
+    :param alpha: Valeur alpha pour l'élagage alpha-bêta
+    :param beta: Valeur bêta pour l'élagage alpha-bêta
+    :param maximizing_player: Booléen indiquant si le joueur actuel est le joueur maximisant(True) ou minimisant(False)
+    :param ply: Demi-coup courant depuis la racine de la recherche
+    :param eval_state: Scores « pièce-case » et de structure de pions de la position (calculés si absents)
+    :return: Score d'évaluation du meilleur coup à jouer et le meilleur coup à jouer
+    """
+    stats = search_stats
+
+    if search_stop.is_set() or (search_deadline is not None and time.monotonic() >= search_deadline):
+        raise SearchTimeout
+    stats.nodes += 1
+
+    # Calcul complet de l'évaluation à la racine, elle est ensuite mise à jour à chaque coup
+    if eval_state is None:
+        eval_state = piece_square_score(board, color), pawn_structure_score(board, color)
+    piece_square, pawn_structure = eval_state
+
+    if depth == 0 or board.is_game_over():
+        stats.leaf_evaluations += 1
+        if board.is_checkmate():
+            return (-(MATE_SCORE - ply) if board.turn == color else MATE_SCORE - ply), None
+        return evaluate_incremental(board, color, piece_square, pawn_structure), None
+
+    # Position couverte par les tables de finales : le sous-arbre n'a pas besoin d'être exploré
+    if ply > 0 and is_tablebase_position(board):
+        wdl = probe_tablebase_wdl(board)
+        if wdl is not None:
+            stats.leaf_evaluations += 1
+            value = evaluate_incremental(board, color, piece_square, pawn_structure)
+            if wdl == 2 or wdl == -2:
+                value += TABLEBASE_WIN_SCORE if (wdl > 0) == (board.turn == color) else -TABLEBASE_WIN_SCORE
+            return value, None
+
+    # Consultation de la table de transposition
+    key = tt_key(board, color)
+    alpha_orig, beta_orig = alpha, beta
+    hash_move = None
+    entry = TRANSPOSITION_TABLE.probe(key)
+    stats.tt_probes += 1
+    if entry is not None:
+        stats.tt_hits += 1
+        tt_depth, tt_score, tt_flag, tt_move = entry
+        tt_score = score_from_tt(tt_score, ply)
+        hash_move = tt_move
+        if tt_depth >= depth and tt_move is not None:
+            if tt_flag == TT_EXACT:
+                return tt_score, tt_move
+            elif tt_flag == TT_LOWER:
+                alpha = max(alpha, tt_score)
+            else:
+                beta = min(beta, tt_score)
+            if alpha >= beta:
+                return tt_score, tt_move
+
+    legal_moves = order_moves(board, list(board.legal_moves), hash_move, ply)
+    if maximizing_player:
+        best_value = float('-inf')
+        best_move = None
+        for i, move in enumerate(legal_moves):
+            delta, pawns_changed = move_eval_delta(board, move, color)
+            board.push(move)
+            child_state = (piece_square + delta,
+                           pawn_structure_score(board, color) if pawns_changed else pawn_structure)
+            value, _ = minimax_alpha_beta(board, color, depth - 1, alpha, beta, False, ply + 1, child_state)
+            board.pop()
+            if value > best_value:
+                best_value = value
+                best_move = move
+            alpha = max(alpha, best_value)
+            if alpha >= beta:
+                stats.beta_cutoffs += 1
+                if i == 0:
+                    stats.first_move_cutoffs += 1
+                update_move_ordering(board, move, depth, ply)
+                break
+    else:
+        best_value = float('inf')
+        best_move = None
+        for i, move in enumerate(legal_moves):
+            delta, pawns_changed = move_eval_delta(board, move, color)
+            board.push(move)
+            child_state = (piece_square + delta,
+                           pawn_structure_score(board, color) if pawns_changed else pawn_structure)
+            value, _ = minimax_alpha_beta(board, color, depth - 1, alpha, beta, True, ply + 1, child_state)
+            board.pop()
+            if value < best_value:
+                best_value = value
+                best_move = move
+            beta = min(beta, best_value)
+            if beta <= alpha:
+                stats.beta_cutoffs += 1
+                if i == 0:
+                    stats.first_move_cutoffs += 1
+                update_move_ordering(board, move, depth, ply)
+                break
+
+    # Enregistrement du résultat dans la table de transposition
+    if best_value <= alpha_orig:
+        flag = TT_UPPER
+    elif best_value >= beta_orig:
+        flag = TT_LOWER
+    else:
+        flag = TT_EXACT
+    TRANSPOSITION_TABLE.store(key, depth, score_to_tt(best_value, ply), flag, best_move)
+
+    return best_value, best_move
+
+
+def iterative_deepening(board, color, max_depth, time_limit=None, start_depth=1, on_depth=None, deadline=None):
+    """
+    Fonction lançant des recherches minimax de profondeur croissante (1, 2, 3...) jusqu'à épuisement du temps alloué
+    :param board: État actuel de l'échiquier
+    :param color: Couleur de l'ordinateur
+    :param max_depth: Profondeur maximale de recherche
+    :param time_limit: Temps de réflexion alloué en secondes (None pour chercher jusqu'à la profondeur maximale)
+    :param start_depth: Première profondeur explorée
+    :param on_depth: Fonction appelée à la fin de chaque profondeur avec la profondeur, le score et le meilleur coup
+    :param deadline: Échéance (time.monotonic()) fixée par l'appelant, à la place de time_limit
+    :return: Score d'évaluation, meilleur coup et profondeur de la dernière profondeur entièrement explorée
+             (les statistiques de la recherche sont disponibles dans search_stats)
+    """
+
+    global search_deadline, search_stats
+
+    start = time.monotonic()
+    if deadline is None and time_limit is not None:
+        deadline = start + time_limit
+    search_stats = stats = SearchStats()
+    best_value, best_move, best_depth = None, None, 0
+
+    # La recherche travaille sur une copie : une interruption peut survenir au milieu d'une séquence de coups
+    search_board = board.copy()
+
+    try:
+        for depth in range(start_depth, max_depth + 1):
+            try:
+                value, move = minimax_alpha_beta(search_board, color, depth, -float('inf'), float('inf'), True)
+            except SearchTimeout:
+                break
+
+            best_value, best_move, best_depth = value, move, depth
+            stats.depth = depth
+            stats.depth_nodes.append(stats.nodes)
+            if on_depth is not None:
+                on_depth(depth, value, move)
+
+            # La première profondeur est toujours terminée pour garantir un coup, l'échéance s'applique ensuite
+            # (une recherche anticipée reçoit son échéance de l'extérieur, lorsque le coup attendu est joué)
+            if deadline is not None:
+                search_deadline = deadline
+
+            # La profondeur suivante coûte plusieurs fois la précédente : inutile de la commencer si elle
+            # n'a aucune chance de se terminer dans le temps restant
+            if search_deadline is not None and time.monotonic() - start >= (search_deadline - start) / 2:
+                break
+    finally:
+        search_deadline = None
+
+    stats.finish(best_value, best_move)
+    return best_value, best_move, best_depth
+
+
+# ----------------------------------------- Recherche parallèle (Lazy SMP) ------------------------------------------ #
+SEARCH_WORKERS = 1  # Nombre de processus de recherche (1 pour une recherche dans le processus principal)
+# Méthode de création des processus : "spawn" démarre un interpréteur neuf, sans dupliquer les fils d'exécution du
+# processus principal (interface, recherche anticipée) comme le ferait "fork", au risque d'un interblocage
+PARALLEL_START_METHOD = "spawn"
+# Réglages recopiés dans chaque processus, qui importe le moteur avec ses valeurs par défaut
+WORKER_SETTINGS = ("MAX_SEARCH_DEPTH", "SYZYGY", "SYZYGY_PATH")
+
+shared_table_memory = None  # Segment de mémoire partagée contenant la table de transposition
+
+
+def share_transposition_table():
+    """
+    Fonction plaçant la table de transposition dans un segment de mémoire partagée (une seule fois)
+    :return: Segment de mémoire partagée contenant la table
+    """
+    global shared_table_memory, TRANSPOSITION_TABLE
+
+    if shared_table_memory is None:
+        shared_table_memory = shared_memory.SharedMemory(create=True, size=len(TRANSPOSITION_TABLE.data))
+        table = TranspositionTable(buffer=shared_table_memory.buf)
+        table.data[:len(TRANSPOSITION_TABLE.data)] = TRANSPOSITION_TABLE.data
+        table.age = TRANSPOSITION_TABLE.age
+        TRANSPOSITION_TABLE = table
+        atexit.register(release_shared_table)
+
+    return shared_table_memory
+
+
+def release_shared_table():
+    # Fonction libérant le segment de mémoire partagée de la table de transposition à la fin du programme
+    global shared_table_memory, TRANSPOSITION_TABLE
+
+    if shared_table_memory is not None:
+        # Les processus de recherche restent attachés au segment : ils sont arrêtés avant qu'il soit libéré
+        stop_search_pool()
+        TRANSPOSITION_TABLE = TranspositionTable(buffer=bytearray(TRANSPOSITION_TABLE.data))
+        shared_table_memory.close()
+        shared_table_memory.unlink()
+        shared_table_memory = None
+
+
+def lazy_smp_worker(worker_id, memory_name, tasks, stop_event, results):
+    """
+    Fonction exécutée par chaque processus de la recherche parallèle. Le processus reste attaché à la table de
+    transposition partagée et attend les recherches que lui confie le processus principal : chacune est un
+    approfondissement itératif complet. Les processus commencent à des profondeurs décalées pour ne pas explorer
+    l'arbre dans le même ordre et profiter des résultats des autres.
+    :param worker_id: Numéro du processus
+    :param memory_name: Nom du segment de mémoire partagée contenant la table de transposition
+    :param tasks: File des recherches à effectuer (None pour arrêter le processus)
+    :param stop_event: Événement partagé signalant la fin de la recherche en cours
+    :param results: File dans laquelle le processus dépose ses résultats
+    """
+    global TRANSPOSITION_TABLE, search_stop, tablebase, tablebase_pieces, tablebase_checked
+
+    memory = shared_memory.SharedMemory(name=memory_name)
+    try:
+        TRANSPOSITION_TABLE = TranspositionTable(buffer=memory.buf)
+        search_stop = stop_event
+        results.put((0, worker_id))  # Processus prêt
+
+        for search_id, age, settings, board, color, max_depth, deadline in iter(tasks.get, None):
+            try:
+                # Réglages du processus principal au moment de la recherche (voir WORKER_SETTINGS)
+                if settings["SYZYGY_PATH"] != SYZYGY_PATH:
+                    tablebase, tablebase_pieces, tablebase_checked = None, 0, False
+                globals().update(settings)
+                TRANSPOSITION_TABLE.age = age
+                clear_move_ordering()
+
+                # Un processus créé sans duplication doit recenser lui-même les tables de finales
+                if SYZYGY:
+                    open_tablebase()
+
+                value, move, depth = iterative_deepening(board, color, max_depth, deadline=deadline,
+                                                         start_depth=min(max_depth, 1 + worker_id % 2))
+                results.put((search_id, worker_id, depth, value, move, search_stats))
+            except Exception:
+                results.put((search_id, worker_id, format_exc()))
+    finally:
+        # La table ne doit plus référencer le segment partagé au moment de le fermer
+        TRANSPOSITION_TABLE = None
+        memory.close()
+
+
+class SearchPool:
+    """
+    Processus de la recherche parallèle. Ils sont démarrés une seule fois puis réutilisés d'un coup à l'autre :
+    démarrer un interpréteur coûte plusieurs centaines de millisecondes, davantage que le temps de réflexion
+    d'un coup en partie rapide.
+    """
+
+    def __init__(self, workers, memory_name):
+        """
+        :param workers: Nombre de processus de recherche
+        :param memory_name: Nom du segment de mémoire partagée contenant la table de transposition
+        """
+        context = multiprocessing.get_context(PARALLEL_START_METHOD)
+        self.memory_name = memory_name
+        self.search_id = 0
+        self.stop_event = context.Event()
+        self.results = context.Queue()
+        self.tasks = [context.Queue() for _ in range(workers)]
+        self.processes = [context.Process(target=lazy_smp_worker, daemon=True, name="lazy-smp-%d" % i,
+                                          args=(i, memory_name, self.tasks[i], self.stop_event, self.results))
+                          for i in range(workers)]
+        for process in self.processes:
+            process.start()
+
+        # Attente de l'importation du moteur dans chaque processus : la première recherche n'en paie pas le coût
+        ready = 0
+        while ready < workers:
+            try:
+                self.results.get(timeout=0.01)
+                ready += 1
+            except queue.Empty:
+                self.check_alive()
+
+    def check_alive(self):
+        # Vérifie qu'aucun processus ne s'est arrêté (échec de l'importation, processus tué)
+        for process in self.processes:
+            if not process.is_alive():
+                raise RuntimeError("le processus de recherche %s s'est arrêté (code de sortie %s)"
+                                   % (process.name, process.exitcode))
+
+    def search(self, board, color, max_depth, deadline):
+        """
+        Confie une recherche à tous les processus et attend leurs résultats
+        :param board: État actuel de l'échiquier
+        :param color: Couleur de l'ordinateur
+        :param max_depth: Profondeur maximale de recherche
+        :param deadline: Échéance commune (time.monotonic()), ou None pour chercher jusqu'à la profondeur maximale
+        :return: Liste des résultats (numéro du processus, profondeur, score, coup, statistiques)
+        """
+        self.search_id += 1
+        self.stop_event.clear()
+        settings = {name: globals()[name] for name in WORKER_SETTINGS}
+        for tasks in self.tasks:
+            tasks.put((self.search_id, TRANSPOSITION_TABLE.age, settings, board, color, max_depth, deadline))
+
+        collected = []
+        try:
+            while len(collected) < len(self.processes):
+                try:
+                    result = self.results.get(timeout=0.01)
+                except queue.Empty:
+                    self.check_alive()
+                else:
+                    # Les résultats d'une recherche précédente interrompue par une erreur sont ignorés
+                    if result[0] != self.search_id:
+                        continue
+                    if len(result) == 3:
+                        raise RuntimeError("échec du processus de recherche %d :\n%s" % result[1:])
+                    collected.append(result[1:])
+
+                # Dès qu'un processus a terminé (profondeur maximale atteinte ou échéance), les autres s'arrêtent.
+                # L'annulation et l'échéance fixée de l'extérieur (recherche anticipée) sont aussi transmises.
+                if collected or search_stop.is_set() or (search_deadline is not None
+                                                         and time.monotonic() >= search_deadline):
+                    self.stop_event.set()
+        finally:
+            self.stop_event.set()
+
+        return collected
+
+    def close(self):
+        # Arrête les processus (ceux qui ne répondent pas sont tués)
+        self.stop_event.set()
+        for tasks in self.tasks:
+            tasks.put(None)
+        for process in self.processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+
+search_pool = None  # Processus de la recherche parallèle, démarrés à la première recherche
+
+
+def start_search_pool(workers=None):
+    """
+    Fonction démarrant les processus de la recherche parallèle s'ils ne sont pas déjà prêts (nombre de processus
+    modifié, table de transposition remplacée). Elle peut être appelée à l'avance pour que le premier coup ne paie
+    pas le démarrage des processus.
+    :param workers: Nombre de processus de recherche (SEARCH_WORKERS par défaut)
+    :return: Processus de la recherche parallèle
+    """
+    global search_pool
+
+    workers = workers if workers is not None else SEARCH_WORKERS
+    memory = share_transposition_table()
+    if search_pool is None or len(search_pool.processes) != workers or search_pool.memory_name != memory.name:
+        stop_search_pool()
+        search_pool = SearchPool(workers, memory.name)
+    return search_pool
+
+
+def stop_search_pool():
+    # Fonction arrêtant les processus de la recherche parallèle
+    global search_pool
+
+    if search_pool is not None:
+        search_pool.close()
+        search_pool = None
+
+
+def parallel_search(board, color, max_depth, time_limit, workers):
+    """
+    Fonction répartissant la recherche du meilleur coup sur plusieurs processus (Lazy SMP)
+    :param board: État actuel de l'échiquier
+    :param color: Couleur de l'ordinateur
+    :param max_depth: Profondeur maximale de recherche
+    :param time_limit: Temps de réflexion alloué en secondes (None pour chercher jusqu'à la profondeur maximale)
+    :param workers: Nombre de processus de recherche
+    :return: Score d'évaluation et meilleur coup du processus ayant atteint la plus grande profondeur
+             (les statistiques cumulées des processus sont disponibles dans search_stats)
+    """
+    global search_stats
+
+    search_stats = stats = SearchStats()
+
+    # L'échéance est fixée avant de confier la recherche : les processus la reçoivent telle quelle, time.monotonic()
+    # étant la même horloge pour tous les processus de la machine
+    deadline = stats.start + time_limit if time_limit is not None else None
+    collected = start_search_pool(workers).search(board, color, max_depth, deadline)
+
+    for result in collected:
+        stats.add(result[4])
+
+    # Meilleur résultat : la plus grande profondeur terminée, le processus principal en cas d'égalité
+    collected = [result for result in collected if result[3] is not None]
+    if not collected:
+        stats.finish(None, None)
+        return None, None
+    _, stats.depth, value, move, _ = max(collected, key=lambda result: (result[1], -result[0]))
+    stats.finish(value, move)
+    return value, move
+
+
+def benchmark_parallel_search(boards, depth, worker_counts=(1, 2, 4)):
+    """
+    Fonction mesurant le temps nécessaire pour atteindre une profondeur donnée selon le nombre de processus
+    :param boards: Liste d'échiquiers servant de corpus
+    :param depth: Profondeur à atteindre
+    :param worker_counts: Nombres de processus à comparer
+    :return: Dictionnaire {nombre de processus: temps total en secondes}
+    """
+    timings = {}
+    for workers in worker_counts:
+        # Les processus sont démarrés avant la mesure, comme ils le sont une seule fois pendant une partie
+        if workers > 1:
+            start_search_pool(workers)
+        start = time.perf_counter()
+        for board in boards:
+            # Chaque mesure part d'une table vide pour ne pas profiter des recherches précédentes
+            TRANSPOSITION_TABLE.clear()
+            clear_move_ordering()
+            if workers > 1:
+                parallel_search(board, board.turn, depth, None, workers)
+            else:
+                iterative_deepening(board, board.turn, depth)
+        timings[workers] = time.perf_counter() - start
+    return timings
+
+
+# -------------------------------------------- Bibliothèque d'ouvertures -------------------------------------------- #
+OPENING_BOOK = True  # Consultation de la bibliothèque d'ouvertures avant la recherche
+OPENING_BOOK_PATH = "books/opening_book.bin"  # Bibliothèque d'ouvertures au format Polyglot
+
+opening_book = None  # Lecteur de la bibliothèque, ouvert à la première consultation
+
+
+def probe_opening_book(board):
+    """
+    Fonction recherchant un coup de la bibliothèque d'ouvertures pour la position actuelle.
+    Le fichier est projeté en mémoire et parcouru par recherche dichotomique sur la clé de Zobrist : rien n'est
+    chargé à l'avance. Parmi les coups connus, le choix est aléatoire et pondéré par leur poids dans la bibliothèque.
+    :param board: État actuel de l'échiquier
+    :return: Coup de la bibliothèque, ou None si la position n'y figure pas
+    """
+    global opening_book
+
+    if opening_book is None:
+        if not os.path.isfile(OPENING_BOOK_PATH):
+            return None
+        opening_book = chess.polyglot.open_reader(OPENING_BOOK_PATH)
+
+    try:
+        return opening_book.weighted_choice(board).move
+    except IndexError:  # Position absente de la bibliothèque
+        return None
+
+
+# ------------------------------------------- Tables de finales (Syzygy) -------------------------------------------- #
+SYZYGY = True  # Consultation des tables de finales lorsque le nombre de pièces le permet
+SYZYGY_PATH = "syzygy"  # Répertoire contenant les fichiers WDL (.rtbw) et DTZ (.rtbz)
+
+# Bonus (ou malus) ajouté à l'évaluation d'une position gagnée (ou perdue) d'après les tables
+TABLEBASE_WIN_SCORE = 1000
+
+tablebase = None  # Tables de finales disponibles (None si aucune)
+tablebase_pieces = 0  # Nombre maximal de pièces couvert par les tables
+tablebase_checked = False  # Le répertoire des tables n'est parcouru qu'une fois
+
+
+def open_tablebase():
+    """
+    Fonction recensant les tables de finales du répertoire SYZYGY_PATH. Les fichiers ne sont ouverts et projetés
+    en mémoire qu'à leur première consultation.
+    :return: Tables de finales, ou None si aucune table n'est disponible
+    """
+    global tablebase, tablebase_pieces, tablebase_checked
+
+    if not tablebase_checked:
+        tablebase_checked = True
+        if os.path.isdir(SYZYGY_PATH):
+            tables = chess.syzygy.Tablebase()
+            if tables.add_directory(SYZYGY_PATH) and tables.wdl:
+                tablebase = tables
+                # Le nom d'une table (ex. « KRPvKR ») contient une lettre par pièce et le séparateur « v »
+                tablebase_pieces = max(len(name) - 1 for name in tables.wdl)
+
+    return tablebase
+
+
+def is_tablebase_position(board):
+    # Fonction vérifiant que les tables sont activées et couvrent la position (nombre de pièces, pas de droit de roque)
+    return (SYZYGY and tablebase is not None and not board.castling_rights
+            and chess.popcount(board.occupied) <= tablebase_pieces)
+
+
+def probe_tablebase_wdl(board):
+    """
+    Fonction consultant le résultat théorique d'une position (victoire, nulle ou défaite)
+    :param board: État actuel de l'échiquier
+    :return: Résultat du point de vue du joueur au trait (2 gain, 0 nulle, -2 perte, ±1 gain ou perte annulé par
+             la règle des 50 coups), ou None si la table nécessaire est absente
+    """
+    try:
+        return tablebase.probe_wdl(board)
+    except KeyError:  # Table manquante pour cette combinaison de pièces
+        return None
+
+
+def probe_tablebase_root(board):
+    """
+    Fonction choisissant le coup à jouer directement dans les tables de finales : on gagne en se rapprochant
+    le plus vite possible de la prochaine capture ou du prochain coup de pion, on retarde au maximum une défaite
+    :param board: État actuel de l'échiquier
+    :return: Meilleur coup d'après les tables, ou None si une table WDL ou DTZ nécessaire est absente
+    """
+    best_move, best_key = None, None
+    for move in board.legal_moves:
+        board.push(move)
+        try:
+            wdl = -tablebase.probe_wdl(board)
+            dtz = abs(tablebase.probe_dtz(board))
+        except KeyError:
+            return None
+        finally:
+            board.pop()
+
+        # Gain : le plus court chemin ; nulle ou défaite : le plus long
+        key = (wdl, -dtz if wdl > 0 else dtz)
+        if best_key is None or key > best_key:
+            best_move, best_key = move, key
+
+    return best_move
+
+
+def find_best_move(board, depth, color, time_limit=None, on_depth=None):
+    """
+    Fonction déterminant le meilleur coup à jouer selon l'algorithme minmax
+    :param board: État actuel de l'échiquier
+    :param depth: Profondeur maximale de recherche de l'arbre de jeu
+    :param color: Couleur de l'ordinateur
+    :param time_limit: Temps de réflexion alloué en secondes (None pour une recherche à profondeur fixe)
+    :param on_depth: Fonction appelée à la fin de chaque profondeur de la recherche dans le processus principal
+    :return: Score d'évaluation (None pour un coup de la bibliothèque d'ouvertures ou des tables de finales),
+             meilleur coup à jouer (None si la recherche a été annulée avant la profondeur 1) et statistiques
+             de la recherche
+    """
+    global search_stats
+
+    # Coup connu de la bibliothèque d'ouvertures : aucune recherche n'est nécessaire
+    if OPENING_BOOK:
+        book_move = probe_opening_book(board)
+        if book_move is not None:
+            search_stats = SearchStats()
+            search_stats.finish(None, book_move, "book")
+            return None, book_move, search_stats
+
+    # Finale couverte par les tables : le coup est lu directement
+    if SYZYGY and open_tablebase() is not None and is_tablebase_position(board):
+        tablebase_move = probe_tablebase_root(board)
+        if tablebase_move is not None:
+            search_stats = SearchStats()
+            search_stats.finish(None, tablebase_move, "tablebase")
+            return None, tablebase_move, search_stats
+
+    # Les entrées des recherches précédentes restent consultables mais deviennent remplaçables
+    TRANSPOSITION_TABLE.new_search()
+    clear_move_ordering()
+
+    # Recherche répartie sur plusieurs processus si elle est activée
+    if SEARCH_WORKERS > 1:
+        value, best_move = parallel_search(board, color, depth, time_limit, SEARCH_WORKERS)
+        return value, best_move, search_stats
+
+    # Approfondissement itératif pour déterminer le meilleur coup à jouer et sa valeur d'évaluation
+    value, best_move, _ = iterative_deepening(board, color, depth, time_limit, on_depth=on_depth)
+    return value, best_move, search_stats
+
+
+def make_MINMAX_AI_move(board, depth, color, time_limit=None):
+    """
+    Fonction permettant à l'ordinateur de jouer le meilleur coup selon l'algorithme minmax
+    :param board: État actuel de l'échiquier
+    :param depth: Profondeur maximale de recherche de l'arbre de jeu
+    :param color: Couleur de l'ordinateur
+    :param time_limit: Temps de réflexion alloué en secondes (None pour une recherche à profondeur fixe)
+    :return: Échiquier avec le meilleur coup joué selon l'algorithme minmax et statistiques de la recherche
+    """
+
+    value, best_move, stats = find_best_move(board, depth, color, time_limit)
+
+    # Création d'une copie de l'état actuel de l'échiquier
+    new_board = board.copy()
+
+    # Joue le meilleur coup déterminé par la fonction minimax_alpha_beta sur la copie de l'échiquier
+    new_board.push(best_move)
+
+    return new_board, stats
+
+
+# -------------------------------------------- Recherche en arrière-plan -------------------------------------------- #
+# Un seul fil d'exécution pour les recherches : elles partagent la table de transposition et l'historique des coups
+SEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search")
+
+
+PONDER = True  # Recherche anticipée sur le temps de réflexion de l'utilisateur
+
+
+class SearchHandle:
+    """
+    Recherche minimax exécutée en arrière-plan pour ne pas bloquer l'interface graphique.
+    La poignée se consulte comme un future : done() indique la fin de la recherche et result() renvoie l'échiquier
+    avec le coup joué, ou None si la recherche a été annulée. Les statistiques de la recherche sont ensuite
+    disponibles dans l'attribut stats.
+    Avec un coup attendu (ponder_move), la recherche anticipe la réponse de l'utilisateur sans limite de temps
+    jusqu'à ce que ponderhit() lui attribue le temps de réflexion de l'ordinateur.
+    """
+
+    def __init__(self, board, depth, color, time_limit=None, ponder_move=None):
+        """
+        :param board: État actuel de l'échiquier (copié, la partie peut continuer d'être affichée)
+        :param depth: Profondeur maximale de recherche de l'arbre de jeu
+        :param color: Couleur de l'ordinateur
+        :param time_limit: Temps de réflexion alloué en secondes
+        :param ponder_move: Coup attendu de l'utilisateur pour une recherche anticipée
+        """
+        self.board = board.copy()
+        if ponder_move is not None:
+            self.board.push(ponder_move)
+        self.depth = depth
+        self.color = color
+        self.time_limit = time_limit
+        self.ponder_move = ponder_move
+        self.pondering = ponder_move is not None
+        self.start_time = None
+        self.finished = False
+        self.stats = None
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.future = SEARCH_EXECUTOR.submit(self.run)
+
+    def run(self):
+        # Exécution de la recherche dans le fil dédié
+        global search_stop, search_deadline
+
+        if self.stop_event.is_set():
+            return None
+
+        with self.lock:
+            self.start_time = time.monotonic()
+            time_limit = None if self.pondering else self.time_limit
+            search_stop = self.stop_event
+
+        try:
+            value, best_move, self.stats = find_best_move(self.board, self.depth, self.color, time_limit)
+        finally:
+            with self.lock:
+                self.finished = True
+                search_stop = threading.Event()
+                search_deadline = None
+
+        if self.stop_event.is_set() or best_move is None:
+            return None
+
+        new_board = self.board.copy()
+        new_board.push(best_move)
+        return new_board
+
+    def ponderhit(self, time_limit):
+        """
+        Signale que l'utilisateur a joué le coup attendu : la recherche anticipée devient la recherche du coup
+        de l'ordinateur. Le temps déjà passé à anticiper est décompté du temps alloué.
+        :param time_limit: Temps de réflexion alloué en secondes
+        """
+        global search_deadline
+
+        with self.lock:
+            self.pondering = False
+            self.time_limit = time_limit
+            if self.start_time is not None and not self.finished:
+                search_deadline = self.start_time + time_limit
+
+    def done(self):
+        # Indique si la recherche est terminée
+        return self.future.done()
+
+    def result(self):
+        # Renvoie l'échiquier avec le coup de l'ordinateur (bloquant si la recherche n'est pas terminée)
+        return self.future.result()
+
+    def cancel(self):
+        # Interrompt la recherche au prochain nœud visité, son résultat sera ignoré
+        self.stop_event.set()
+
+
+def start_ponder(board, color):
+    """
+    Fonction lançant la recherche anticipée de la position attendue après la réponse de l'utilisateur
+    :param board: État actuel de l'échiquier (après le coup de l'ordinateur)
+    :param color: Couleur de l'ordinateur
+    :return: Recherche anticipée, ou None si aucune réponse n'est attendue
+    """
+    if board.is_game_over():
+        return None
+
+    # La réponse attendue est le meilleur coup de l'utilisateur trouvé par la dernière recherche
+    entry = TRANSPOSITION_TABLE.probe(tt_key(board, color))
+    if entry is None or entry[3] is None or not board.is_legal(entry[3]):
+        return None
+
+    return SearchHandle(board, MAX_SEARCH_DEPTH, color, ponder_move=entry[3])
+
+
+def cancel_search(search):
+    """
+    Fonction annulant une recherche en arrière-plan si elle existe
+    :param search: Recherche en cours (ou None)
+    :return: None, pour remplacer la référence à la recherche annulée
+    """
+    if search is not None:
+        search.cancel()
+    return None
@@ -1,6 +1,7 @@
+import argparse
 import pygame
+import math
 import time
-import threading
 import chess
 import chess.svg
 import chess.engine
@@ -10,6 +11,10 @@ from traceback import format_exc
 from sys import stderr
 from time import strftime
 from copy import deepcopy
+from collections import OrderedDict
+
+from engine import (MAX_SEARCH_DEPTH, PONDER, SearchHandle, allocate_move_time, cancel_search, log_search_stats,
+                    make_random_AI_move, start_ponder)
 
 pygame.init()
 
@@ -96,13 +101,16 @@ PIECES_PROMOTION = {
 CLOCK = pygame.time.Clock()
 CLOCK_TICK = 60
 
+IDLE_TIMEOUT = 500  # Attente maximale des événements lorsque rien ne bouge à l'écran (en millisecondes)
+
 # Récupération des dimensions de l'écran
 info = pygame.display.Info()
 SCREEN_WIDTH = info.current_w
 SCREEN_HEIGHT = info.current_h
 
-# Création de la fenêtre graphique en plein écran
-SCREEN = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
+# Fenêtre graphique en plein écran, créée au lancement du jeu : les processus de la recherche parallèle importent
+# aussi ce module et ne doivent pas ouvrir de fenêtre
+SCREEN = None
 
 # Calcul de la position du coin supérieur gauche de la grille
 GRID_X = (SCREEN_WIDTH - 8 * SQUARE_SIDE) // 2
@@ -121,23 +129,86 @@ pos_change_theme_button = [GRID_X + 8 * SQUARE_SIDE, GRID_Y + 10]
 reset_score_button = pygame.image.load("images/reset.png")
 pos_reset_score_button = [pos_change_theme_button[0], pos_change_theme_button[1] + 50]
 
+# Images mises à l'échelle et converties au format de l'écran, indexées par (image, taille)
+sprite_cache = {}
+sprite_cache_side = SQUARE_SIDE  # Taille des cases pour laquelle les images en cache ont été construites
 
-# ---------------------------------------------- Fonctions utilitaires ---------------------------------------------- #
-def is_in_board():
-    # Fonction vérifiant que le clic de la souris est dans l'échiquier
-    mouse_pos = pygame.mouse.get_pos()
 
-    if GRID_X <= mouse_pos[0] <= GRID_X + 8 * SQUARE_SIDE and GRID_Y <= mouse_pos[1] <= GRID_Y + 8 * SQUARE_SIDE:
-        return True
-    return False
+def get_sprite(image, size):
+    """
+    Fonction renvoyant une image mise à l'échelle : elle n'est redimensionnée et convertie qu'une seule fois,
+    le cache n'étant vidé que si la taille des cases change
+    :param image: Image chargée
+    :param size: Dimensions (largeur, hauteur) souhaitées
+    :return: Surface mise à l'échelle, prête à être affichée
+    """
+    global sprite_cache_side
+
+    if sprite_cache_side != SQUARE_SIDE:
+        sprite_cache.clear()
+        sprite_cache_side = SQUARE_SIDE
+
+    sprite = sprite_cache.get((image, size))
+    if sprite is None:
+        sprite = pygame.transform.scale(image.convert_alpha(), size)
+        sprite_cache[(image, size)] = sprite
+    return sprite
 
 
-def is_on_play_button(event):
-    # Fonction vérifiant que le clic de la souris est sur le bouton play
-    if pos_play_button[0] <= event.pos[0] <= pos_play_button[0] + dim_play_button[0] and \
-                pos_play_button[1] <= event.pos[1] <= pos_play_button[1] + dim_play_button[1]:
-        return True
-    return False
+# Polices de caractères chargées, indexées par (famille, taille)
+fonts = {}
+
+# Textes déjà rendus, indexés par (texte, police, couleur) : les moins récemment utilisés sont retirés en premier
+TEXT_CACHE_SIZE = 256
+text_cache = OrderedDict()
+
+
+def get_font(family, size):
+    """
+    Fonction renvoyant une police de caractères, chargée une seule fois par famille et par taille
+    :param family: Nom de la police système (None pour la police par défaut de pygame)
+    :param size: Taille de la police
+    :return: Police de caractères
+    """
+    font = fonts.get((family, size))
+    if font is None:
+        font = pygame.font.Font(None, size) if family is None else pygame.font.SysFont(family, size)
+        fonts[(family, size)] = font
+    return font
+
+
+def render_text(text, font, color):
+    """
+    Fonction renvoyant le rendu d'un texte : un texte déjà rendu avec la même police et la même couleur
+    est repris du cache au lieu d'être rendu à nouveau
+    :param text: Texte à afficher
+    :param font: Police de caractères (obtenue avec get_font)
+    :param color: Couleur du texte
+    :return: Surface contenant le texte
+    """
+    key = (text, font, color)
+    surface = text_cache.get(key)
+    if surface is None:
+        surface = font.render(text, True, color)
+        text_cache[key] = surface
+        if len(text_cache) > TEXT_CACHE_SIZE:
+            text_cache.popitem(last=False)
+    else:
+        text_cache.move_to_end(key)
+    return surface
+
+
+# ---------------------------------------------- Fonctions utilitaires ---------------------------------------------- #
+def wait_events(timeout=IDLE_TIMEOUT):
+    """
+    Fonction attendant le prochain événement sans occuper le processeur, puis récupérant les événements en attente
+    :param timeout: Durée maximale d'attente en millisecondes
+    :return: Liste des événements (vide si aucun événement n'est arrivé avant la fin du délai)
+    """
+    event = pygame.event.wait(timeout)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
 
 
 def swap_color(color):
@@ -162,14 +233,14 @@ def get_scores(board_result):
 
 def show_title():
     # Fonction permettant l'affichage du titre sur la fenêtre graphique
-    texte_objet = pygame.font.SysFont("Comic Sans MS", 52).render("Chess Game", True, BLACK)
+    texte_objet = render_text("Chess Game", get_font("Comic Sans MS", 52), BLACK)
     SCREEN.blit(texte_objet, ((SCREEN.get_width() / 2) - texte_objet.get_width() / 2, 40))
 
 
 def show_score(color, white_score, black_score):
     # Fonction permettant l'affichage des scores sur la fenêtre graphique
-    texte_white_score = pygame.font.SysFont("Comic Sans MS", 22).render("Score : " + str(white_score), True, BLACK)
-    texte_black_score = pygame.font.SysFont("Comic Sans MS", 22).render("Score : " + str(black_score), True, BLACK)
+    texte_white_score = render_text("Score : " + str(white_score), get_font("Comic Sans MS", 22), BLACK)
+    texte_black_score = render_text("Score : " + str(black_score), get_font("Comic Sans MS", 22), BLACK)
 
     if color == chess.WHITE:
         SCREEN.blit(texte_white_score, (GRID_X, GRID_Y + 8 * SQUARE_SIDE))
@@ -182,12 +253,10 @@ def show_score(color, white_score, black_score):
 def loose_on_time(ongoing, white_score, black_score):
     # Fonction gérant la défaite au temps d'un des deux joueurs
 
-    global remaining_timeW, remaining_timeB, pauseW, pauseB
-
     ongoing = False
-    pauseW = pauseB = True
+    game_clock.stop()
 
-    if remaining_timeW == 0:
+    if game_clock.flag() == chess.WHITE:
         black_score += 1
     else:
         white_score += 1
@@ -195,206 +264,291 @@ def loose_on_time(ongoing, white_score, black_score):
     return ongoing, white_score, black_score
 
 
+# Historique des coups : chaque ligne (un coup blanc et la réponse noire, en notation SAN) est rendue une seule fois,
+# lorsqu'un coup est joué ou annulé, et seules les lignes de la fenêtre de défilement sont affichées
+MOVE_LIST_SPACING = 5  # Espace entre deux lignes de l'historique
+move_list_moves = []  # Coups figurant dans l'historique
+move_list_sans = []  # Notation SAN de chacun de ces coups
+move_list_rows = []  # Image de chaque ligne de l'historique
+move_list_scroll = None  # Première ligne affichée (None : l'historique suit le dernier coup)
+
+
+def update_move_list(board):
+    # Fonction mettant à jour l'historique : seuls les coups annulés ou joués depuis la dernière mise à jour sont rendus
+    stack = board.move_stack
+
+    # Coups annulés (touche u) ou remplacés (nouvelle partie)
+    while move_list_moves and (len(move_list_moves) > len(stack)
+                               or move_list_moves[-1] != stack[len(move_list_moves) - 1]):
+        move_list_moves.pop()
+        move_list_sans.pop()
+
+    # Les lignes à partir du premier coup modifié sont rendues à nouveau
+    first_row = len(move_list_moves) // 2
+    new_moves = len(stack) - len(move_list_moves)
+    if new_moves == 0 and len(move_list_rows) == (len(move_list_moves) + 1) // 2:
+        return
+
+    # Nouveaux coups : la position précédant chacun d'eux est retrouvée à partir des seuls derniers coups
+    replay = board.copy(stack=new_moves)
+    for _ in range(new_moves):
+        replay.pop()
+    for move in stack[len(move_list_moves):]:
+        move_list_sans.append(replay.san(move))
+        move_list_moves.append(move)
+        replay.push(move)
+
+    font = get_font("Arial", 18)
+    del move_list_rows[first_row:]
+    for row in range(first_row, (len(move_list_sans) + 1) // 2):
+        text = f"{row + 1}. " + " ".join(move_list_sans[2 * row:2 * row + 2])
+        move_list_rows.append(font.render(text, True, BLACK))  # Image conservée : inutile de passer par text_cache
+
+
+def move_list_window():
+    # Fonction renvoyant l'indice de la première ligne affichée et le nombre de lignes visibles de l'historique
+    rect = REGION_RECTS["move_stack"][0]
+    visible = max(1, rect.height // (get_font("Arial", 18).get_height() + MOVE_LIST_SPACING))
+    last_first = max(0, len(move_list_rows) - visible)
+    first = last_first if move_list_scroll is None else min(move_list_scroll, last_first)
+    return first, visible
+
+
+def scroll_move_list(board, rows):
+    """
+    Fonction faisant défiler l'historique des coups (molette de la souris)
+    :param board: État actuel de l'échiquier
+    :param rows: Nombre de lignes de défilement (positif vers les premiers coups)
+    """
+    global move_list_scroll
+
+    update_move_list(board)
+    first, visible = move_list_window()
+    first = max(0, first - rows)
+
+    # Revenu en bas de l'historique : il suit de nouveau le dernier coup
+    move_list_scroll = None if first >= len(move_list_rows) - visible else first
+
+
 def show_move_stack(board):
     # Fonction permettant l'affichage de l'historique des coups sur la fenêtre graphique
+    update_move_list(board)
+    first, visible = move_list_window()
 
-    move_num = 1
     x, y = GRID_X + 8 * SQUARE_SIDE + 10, GRID_Y + 1.5 * SQUARE_SIDE
+    for render in move_list_rows[first:first + visible]:
+        SCREEN.blit(render, (x, y))
+        y += render.get_height() + MOVE_LIST_SPACING
 
-    for i, move in enumerate(board.move_stack):
-        if i % 2 == 0:  # Coup blanc
-            text = f"{move_num}. {move.uci()[2:]}"
-        else:  # Coup noir
-            text += f" {move.uci()[2:]}"
-
-            render = pygame.font.SysFont("Arial", 18).render(text, True, BLACK)
-            SCREEN.blit(render, (x, y))
-            x += render.get_width() + 10
 
-            if move_num % 5 == 0:
-                x = GRID_X + 8 * SQUARE_SIDE + 10
-                y += render.get_height() + 10
+def show_search_stats(stats):
+    # Fonction permettant l'affichage des statistiques de la dernière recherche de l'ordinateur
+    x, y = DIFFICULTY_BUTTON_X, DIFFICULTY_BUTTON_Y + 70
 
-            move_num += 1
+    for line in stats.summary():
+        render = render_text(line, get_font("Arial", 18), BLACK)
+        SCREEN.blit(render, (x, y))
+        y += render.get_height() + 5
 
 
 # ----------------------------------------- Fonctions relatives à l'échiquier -----------------------------------------#
-def paint_light_squares(square_color):
+# Géométrie de l'échiquier dans chaque orientation (couleur des pièces de l'utilisateur), calculée une seule fois.
+# BOARD_SQUARES[couleur][rangée * 8 + colonne] : case affichée à une rangée et une colonne de la grille (0 en haut)
+BOARD_SQUARES = {
+    chess.WHITE: [chess.square(col, 7 - row) for row in range(8) for col in range(8)],
+    chess.BLACK: [chess.square(7 - col, row) for row in range(8) for col in range(8)],
+}
+
+# SQUARE_RECTS[couleur][case] : rectangle d'une case sur l'écran (à ne pas modifier)
+SQUARE_RECTS = {
+    chess.WHITE: [pygame.Rect(GRID_X + chess.square_file(square) * SQUARE_SIDE,
+                              GRID_Y + (7 - chess.square_rank(square)) * SQUARE_SIDE, SQUARE_SIDE, SQUARE_SIDE)
+                  for square in chess.SQUARES],
+    chess.BLACK: [pygame.Rect(GRID_X + (7 - chess.square_file(square)) * SQUARE_SIDE,
+                              GRID_Y + chess.square_rank(square) * SQUARE_SIDE, SQUARE_SIDE, SQUARE_SIDE)
+                  for square in chess.SQUARES],
+}
+
+
+def square_at(pos, color):
     """
-    Fonction pour peindre les cases claires de l'échiquier
-    :param square_color: Couleur associée aux cases claires de l'échiquier
+    Fonction renvoyant la case de l'échiquier située sous un point de l'écran
+    :param pos: Coordonnées du point (position de la souris)
+    :param color: Couleur des pièces de l'utilisateur (orientation de l'échiquier)
+    :return: Case de l'échiquier (entier de python-chess), None en dehors de l'échiquier
     """
+    x, y = pos[0] - GRID_X, pos[1] - GRID_Y
+    if 0 <= x < 8 * SQUARE_SIDE and 0 <= y < 8 * SQUARE_SIDE:
+        return BOARD_SQUARES[color][y // SQUARE_SIDE * 8 + x // SQUARE_SIDE]
+    return None
+
+
+# Police des coordonnées (numéros des rangées et lettres des colonnes) affichées sur le bord de l'échiquier
+coordinates_font = get_font(None, 30)
 
-    # Pour chaque case dans l'ensemble des cases claires de l'échiquier
-    for square in chess.SquareSet(chess.BB_LIGHT_SQUARES):
-        # Récupère la colonne et la rangée de la case actuelle
-        col = chess.square_file(square)
-        row = 7 - chess.square_rank(square)
+# Fonds de l'échiquier (cases et coordonnées) déjà dessinés, indexés par (thème, orientation)
+board_backgrounds = {}
 
-        # Dessine un rectangle de la couleur spécifiée pour la case actuelle
-        pygame.draw.rect(SCREEN, square_color,
-                         (GRID_X + SQUARE_SIDE * col, GRID_Y + SQUARE_SIDE * row, SQUARE_SIDE, SQUARE_SIDE), 0)
+EMPTY_SQUARE = (None, False, None)  # État d'une case sans pièce, sans échec ni marque de coup légal
 
 
-def paint_dark_squares(square_color):
+def get_board_background(color):
     """
-    Fonction pour peindre les cases foncées de l'échiquier
-    :param square_color: Couleur associée aux cases foncées de l'échiquier
+    Fonction renvoyant le fond de l'échiquier pour le thème actuel : il ne dépend que du thème et de l'orientation,
+    il n'est donc dessiné qu'une seule fois pour chacun d'eux (à sa première utilisation)
+    :param color: Couleur des pièces de l'utilisateur (orientation de l'échiquier)
+    :return: Surface de la taille de l'échiquier
     """
+    background = board_backgrounds.get((BOARD_COLOR, color))
+    if background is not None:
+        return background
+
+    background = pygame.Surface((8 * SQUARE_SIDE, 8 * SQUARE_SIDE)).convert()
+
+    for row in range(8):
+        for col in range(8):
+            rect = pygame.Rect(col * SQUARE_SIDE, row * SQUARE_SIDE, SQUARE_SIDE, SQUARE_SIDE)
 
-    # Pour chaque case dans l'ensemble des cases foncées de l'échiquier
-    for square in chess.SquareSet(chess.BB_DARK_SQUARES):
-        # Récupère la colonne et la rangée de la case actuelle
-        col = chess.square_file(square)
-        row = 7 - chess.square_rank(square)
+            # Les coordonnées ne débordent pas de leur case : une case peut être redessinée seule
+            background.set_clip(rect)
 
-        # Dessine un rectangle de la couleur spécifiée pour la case actuelle
-        pygame.draw.rect(SCREEN, square_color,
-                         (GRID_X + SQUARE_SIDE * col, GRID_Y + SQUARE_SIDE * row, SQUARE_SIDE, SQUARE_SIDE), 0)
+            # Case claire ou foncée (le damier est identique dans les deux orientations)
+            background.fill(BOARD_COLOR[0] if (row + col) % 2 == 0 else BOARD_COLOR[1], rect)
 
+            # Numéros des rangées à gauche de l'échiquier, en alternant la couleur pour le contraste avec les cases
+            if col == 0:
+                row_number = str(8 - row) if color == chess.WHITE else str(row + 1)
+                text = render_text(row_number, coordinates_font, BOARD_COLOR[1] if row % 2 == 0 else BOARD_COLOR[0])
+                background.blit(text, (0, row * SQUARE_SIDE))
 
-def get_square_rect(square, color=chess.WHITE):
+            # Lettres des colonnes en bas de l'échiquier
+            if row == 7:
+                col_letter = chr(ord('a') + col) if color == chess.WHITE else chr(ord('h') - col)
+                text = render_text(col_letter, coordinates_font, BOARD_COLOR[0] if col % 2 == 0 else BOARD_COLOR[1])
+                background.blit(text, (col * SQUARE_SIDE + SQUARE_SIDE - 12, 8 * SQUARE_SIDE - 20))
+
+    background.set_clip(None)
+    board_backgrounds[(BOARD_COLOR, color)] = background
+    return background
+
+
+# Coups légaux de la position affichée, regroupés par case de départ (recalculés seulement si la position change)
+move_map_position = None
+move_map = {}
+
+
+def get_move_map(board):
     """
-    Fonction pour obtenir les coordonnées du rectangle correspondant à une case donnée
-    :param square: La case pour laquelle on veut obtenir les coordonnées du rectangle correspondant
-    :param color: Couleur du joueur actuel
-    :return: Un objet Rect représentant la position et la taille de la case sur l'écran
+    Fonction renvoyant les coups légaux de la position, regroupés par case de départ puis par case d'arrivée.
+    La table n'est construite qu'une fois par position : elle sert à l'affichage des coups possibles de la pièce
+    sélectionnée à chaque image et à la vérification des coups de l'utilisateur.
+    :param board: État actuel de l'échiquier
+    :return: Dictionnaire {case de départ: {case d'arrivée: (prise, pièces de promotion possibles)}}
     """
+    global move_map_position, move_map
 
-    # Si la couleur est noire, les colonnes et les rangées doivent être inversées
-    if color == chess.BLACK:
-        # Récupère la colonne et la rangée de la case actuelle
-        col = 7 - chess.square_file(chess.parse_square(square.lower()))
-        row = chess.square_rank(chess.parse_square(square.lower()))
-    else:
-        col = chess.square_file(chess.parse_square(square.lower()))
-        row = 7 - chess.square_rank(chess.parse_square(square.lower()))
+    position = board.fen()
+    if position != move_map_position:
+        move_map = {}
+        for move in board.legal_moves:
+            destinations = move_map.setdefault(move.from_square, {})
+            capture, promotions = destinations.get(move.to_square, (board.is_capture(move), frozenset()))
+            destinations[move.to_square] = (capture, promotions | {move.promotion})
+        move_map_position = position
 
-    return pygame.Rect((GRID_X + col * SQUARE_SIDE, GRID_Y + row * SQUARE_SIDE), (SQUARE_SIDE, SQUARE_SIDE))
+    return move_map
 
 
-def print_empty_board(color=chess.WHITE):
+def is_legal_move(board, move):
+    # Fonction vérifiant qu'un coup est légal à l'aide de la table des coups de la position
+    destination = get_move_map(board).get(move.from_square, {}).get(move.to_square)
+    if destination is None:
+        # Roque saisi en posant le roi sur sa propre tour : python-chess l'accepte aussi
+        return board.is_castling(move) and board.is_legal(move)
+    return move.promotion in destination[1]
+
+
+def get_squares_state(board, selected_square=None):
     """
-    Fonction permettant l'affichage de l'échiquier vide (sans les pièces)
-    :param color: Couleur des pièces de l'utilisateur
-    :return: L'échiquier vide
+    Fonction décrivant le contenu de chaque case de l'échiquier : une case n'est redessinée que si son état change
+    :param board: État actuel de l'échiquier
+    :param selected_square: Case sélectionnée par l'utilisateur
+    :return: Liste des 64 états (pièce, case du roi en échec, marque de coup légal : None, "move" ou "capture")
     """
 
-    # Remplissage de l'écran avec la couleur blanche
-    SCREEN.fill(WHITE)
+    # Case du roi en échec (ou en échec et mat)
+    check_square = board.king(board.turn) if board.is_check() else None
 
-    # Dessin des cases claires et foncées de l'échiquier
-    paint_light_squares(BOARD_COLOR[0])
-    paint_dark_squares(BOARD_COLOR[1])
+    # Cases de destination des coups légaux de la pièce sélectionnée
+    targets = {}
+    if selected_square is not None:
+        destinations = get_move_map(board).get(selected_square, {})
+        targets = {to_square: "capture" if capture else "move" for to_square, (capture, _) in destinations.items()}
 
-    # Déclaration d'une police d'écriture de taille 30
-    font = pygame.font.Font(None, 30)
+    return [(board.piece_at(square), square == check_square, targets.get(square)) for square in chess.SQUARES]
 
-    # Ajout des numéros des lignes à gauche de l'échiquier
-    for row in range(8):
-        if color == chess.WHITE:
-            row_number = str(8 - row)
-        else:
-            row_number = str(row + 1)
 
-        # Alternance de la couleur des numéros pour le contraste avec les cases
-        if row % 2 == 0:
-            text = font.render(row_number, True, BOARD_COLOR[1])
-        else:
-            text = font.render(row_number, True, BOARD_COLOR[0])
+def draw_square(square, color, state, background=True):
+    """
+    Fonction dessinant une case : fond, échec, pièce et marque de coup légal
+    :param square: Case à dessiner
+    :param color: Couleur des pièces de l'utilisateur
+    :param state: État de la case renvoyé par get_squares_state
+    :param background: Dessin du fond de la case (inutile si le fond de tout l'échiquier vient d'être affiché)
+    :return: Rectangle de la case sur l'écran
+    """
+    piece, in_check, target = state
+    rect = SQUARE_RECTS[color][square]
 
-        # Affichage du texte à l'écran
-        SCREEN.blit(text, (GRID_X, GRID_Y + row * SQUARE_SIDE))
+    # Fond de la case (couleur et coordonnées), repris du fond pré-dessiné de l'échiquier
+    if background:
+        SCREEN.blit(get_board_background(color), rect, rect.move(-GRID_X, -GRID_Y))
 
-    # Ajout des lettres des colonnes en bas de l'échiquier
-    for col in range(8):
-        if color == chess.WHITE:
-            col_letter = chr(ord('a') + col)
-        else:
-            col_letter = chr(ord('h') - col)
+    # Case du roi en échec en rouge
+    if in_check:
+        pygame.draw.rect(SCREEN, RED_CHECK, rect, 0)
 
-        # Alternance de la couleur des lettres pour le contraste avec les cases
-        if col % 2 == 0:
-            text = font.render(col_letter, True, BOARD_COLOR[0])
-        else:
-            text = font.render(col_letter, True, BOARD_COLOR[1])
+    # Dessine la pièce sur la case
+    if piece is not None:
+        image = PIECES_IMAGES[piece.color][piece.piece_type]  # Récupère l'image de la pièce
+        SCREEN.blit(get_sprite(image, (SQUARE_SIDE, SQUARE_SIDE)), rect)
+
+    # Mise en surbrillance des coups légaux de la pièce sélectionnée
+    if target == "capture":
+        # Dessine un cercle rouge autour de la case de destination
+        pygame.draw.circle(SCREEN, (255, 30, 30), rect.center, 35, 5)
+    elif target == "move":
+        # Dessine un cercle gris sur la case de destination
+        pygame.draw.circle(SCREEN, (128, 128, 128), rect.center, 10)
 
-        # Affichage du texte à l'écran
-        SCREEN.blit(text, (GRID_X + col * SQUARE_SIDE + SQUARE_SIDE - 12, GRID_Y + 8 * SQUARE_SIDE - 20))
+    return rect
 
 
-def print_board(board, color=chess.WHITE, selected_square=None):
+def print_board(board, color=chess.WHITE, selected_square=None, previous_state=None):
     """
     Fonction permettant l'affichage de l'échiquier (avec les pièces)
     :param board: État actuel de l'échiquier
     :param color: Couleur des pièces de l'utilisateur
     :param selected_square: Case sélectionnée par l'utilisateur
-    :return: Échiquier remplit
+    :param previous_state: États des cases lors du dernier affichage (tout l'échiquier est dessiné si absent)
+    :return: États des cases affichées et rectangles des cases redessinées
     """
+    state = get_squares_state(board, selected_square)
 
-    # Affichage de l'échiquier vide
-    print_empty_board(color)
-
-    # Vérifie si le roi est en échec ou en échec et mat
-    if board.is_checkmate() or board.is_check():
-        # Récupère la position du roi
-        if board.turn == chess.WHITE:
-            king_square = board.king(chess.WHITE)
-        else:
-            king_square = board.king(chess.BLACK)
-
-        # Récupère les coordonnées de la case du roi
-        rect = get_square_rect(chess.square_name(king_square), color)
-
-        #  Dessine un rectangle rouge autour de la case du roi
-        pygame.draw.rect(SCREEN, RED_CHECK, rect, 0)
+    # Échiquier complet : le fond est affiché en une fois, seules les cases occupées ou marquées sont ensuite dessinées
+    if previous_state is None:
+        SCREEN.blit(get_board_background(color), (GRID_X, GRID_Y))
+        for square in chess.SQUARES:
+            if state[square] != EMPTY_SQUARE:
+                draw_square(square, color, state[square], background=False)
+        return state, [BOARD_RECT]
 
-    # Parcours de toutes les cases de l'échiquier
+    rects = []
     for square in chess.SQUARES:
-        # Récupère la pièce sur la case
-        piece = board.piece_at(square)
-
-        # Si la case contient une pièce
-        if piece is not None:
-            piece_color = piece.color  # Récupère la couleur de la pièce
-            piece_type = piece.piece_type  # Récupère le type de la pièce
-            image = PIECES_IMAGES[piece_color][piece_type]  # Récupère l'image de la pièce
-
-            # Dessine la pièce sur la case
-            SCREEN.blit(pygame.transform.scale(image, (SQUARE_SIDE, SQUARE_SIDE)),
-                        get_square_rect(chess.square_name(square).lower(), color))
-
-        # Mise en surbrillance des coups légaux pour la pièce sélectionnée
-        if selected_square is not None and selected_square == chess.square_name(square).lower():
-            # Récupération des coups légaux pour la pièce sélectionnée
-            legal_moves = [move.uci() for move in board.legal_moves
-                           if chess.square_name(move.from_square).lower() == selected_square]
-
-            # Parcours des coups légaux
-            for move in legal_moves:
-                """Dans le cas d'une promotion de pion, on ignore la dernière lettre correspondant 
-                à la pièce choisie lors de la promotion"""
-
-                # Récupération des coordonnées de la case de destination
-                square_rect = get_square_rect(move[2:-1], color) if len(move) > 4 else get_square_rect(move[2:], color)
-
-                # Récupère la position centrale de la case de destination
-                center_x = square_rect.left + square_rect.width // 2
-                center_y = square_rect.top + square_rect.height // 2
-
-                if len(move) <= 4:
-                    # Vérifie si le coup est une capture
-                    if board.is_capture(chess.Move(chess.parse_square(move[:2]), chess.parse_square(move[2:]))):
-                        # Dessine un cercle rouge autour de la case / des cases de destination
-                        pygame.draw.circle(SCREEN, (255, 30, 30), (center_x, center_y), 35, 5)
-                    else:
-                        # Dessine un cercle gris autour de la case / des cases de destination
-                        pygame.draw.circle(SCREEN, (128, 128, 128), (center_x, center_y), 10)
-                else:
-                    if board.is_capture(chess.Move(chess.parse_square(move[:2]), chess.parse_square(move[2:-1]))):
-                        pygame.draw.circle(SCREEN, (255, 30, 30), (center_x, center_y), 35, 5)
-                    else:
-                        pygame.draw.circle(SCREEN, (128, 128, 128), (center_x, center_y), 10)
+        if previous_state[square] != state[square]:
+            rects.append(draw_square(square, color, state[square]))
+
+    return state, rects
 
 
 # Constantes pour le panel de promotion de pion
@@ -433,15 +587,18 @@ def display_promotion_panel(color, file):
 
     # Affichez les images des pièces de promotion en fonction de la couleur
     for piece, image in PIECES_PROMOTION[color].items():
-        SCREEN.blit(pygame.transform.scale(image, (50, 50)), (panel_x+dec, panel_y))
+        SCREEN.blit(get_sprite(image, (50, 50)), (panel_x+dec, panel_y))
         dec += 50
 
     # Mis à jour de l'affichage
     pygame.display.flip()
 
+    # Le panel recouvre l'échiquier : l'écran sera entièrement redessiné après le choix
+    request_full_redraw()
+
     running = True
     while running:
-        for event in pygame.event.get():
+        for event in wait_events():
             if event.type == pygame.QUIT:
                 running = False
             if event.type == pygame.MOUSEBUTTONDOWN:
@@ -490,10 +647,8 @@ def promote_pawn(board, move, color):
 def resign(ongoing, color, white_score, black_score):
     # Fonction permettant l'abandon de l'utilisateur
 
-    global pauseW, pauseB
-
     ongoing = False
-    pauseW = pauseB = True
+    game_clock.stop()
 
     if color == chess.WHITE:
         black_score += 1
@@ -503,30 +658,6 @@ def resign(ongoing, color, white_score, black_score):
     return ongoing, white_score, black_score
 
 
-def coord2str(mouse_pos, color):
-    """
-    Fonction permettant de convertir les coordonnées de la souris en case de l'échiquier
-    :param mouse_pos: Coordonnées de la souris
-    :param color: Couleur des pièces de l'utilisateur
-    :return: Case de l'échiquier en notation échecs (ex "a1", "h8")
-    """
-
-    mouse_pos = (mouse_pos[0] - GRID_X, mouse_pos[1] - GRID_Y)
-
-    # Récupération de la colonne et de la rangée de la case en fonction des coordonnées de la souris
-    col = 7 - (mouse_pos[0] // SQUARE_SIDE) if color == chess.BLACK else (mouse_pos[0] // SQUARE_SIDE)
-    row = 7 - (mouse_pos[1] // SQUARE_SIDE) if color == chess.WHITE else (mouse_pos[1] // SQUARE_SIDE)
-
-    # Convertir la colonne en lettre (par exemple 0 --> 'a', 1 --> 'b', etc.)
-    col_letter = chr(ord('a') + col)
-
-    # Convertir la rangée en chiffre
-    row_number = row + 1
-
-    # Concaténer la lettre de la colonne et le chiffre de la rangée pour former la notation d'échecs
-    return f"{col_letter}{row_number}"
-
-
 def try_move(board, move, color):
     """
     Fonction permettant de jouer un coup s'il est légal
@@ -537,7 +668,7 @@ def try_move(board, move, color):
     """
     try:
         # Vérifie si le coup se trouve dans l'ensemble des coups légaux de l'état actuel de l'échiquier
-        if move in board.legal_moves:
+        if is_legal_move(board, move):
             # Joue le coup
             board.push(move)
 
@@ -556,224 +687,6 @@ def try_move(board, move, color):
         return board
 
 
-# ----------------------------------------------- Algorithme de jeux  ----------------------------------------------- #
-def make_random_AI_move(board):
-    # Fonction permettant à l'IA de jouer des coups aléatoires
-
-    legal_moves = list(board.legal_moves)  # Liste de coups légaux
-
-    if not legal_moves:  # S'il n'y a pas de coup, c'est sûrement qu'il y a échec et mat ou égalité
-        return board
-
-    # Choix d'un coup aléatoire
-    random_move = random.choice(legal_moves)
-
-    # Création d'une copie de l'état actuel de l'échiquier
-    new_board = board.copy()
-
-    # Joue le coup aléatoire
-    new_board.push(random_move)
-
-    return new_board
-
-
-PIECES_VALUES = {
-    chess.PAWN: 1,
-    chess.KNIGHT: 3,
-    chess.BISHOP: 3,
-    chess.ROOK: 5,
-    chess.QUEEN: 9
-}
-
-development_coefficients = {
-    chess.PAWN: 2,
-    chess.KNIGHT: 0.5,
-    chess.BISHOP: 0.5,
-    chess.ROOK: 0.15,
-    chess.QUEEN: 0.1
-}
-
-
-def is_pawn_supported(board, square, color):
-    """
-    Fonction vérifiant si le pion à une case donnée est supporté par un autre pion de même couleur
-    :param board: État actuel de l'échiquier
-    :param square: Case où se trouve le pion
-    :param color: Couleur du pion
-    :return: Vrai si le pion est supporté, faux sinon
-    """
-
-    # Récupération de la colonne et de la rangée
-    file, rank = chess.square_file(square), chess.square_rank(square)
-    adjacent_files = [file - 1, file + 1]  # Les colonnes adjacentes
-
-    # Parcours des colonnes adjacentes
-    for adj_file in adjacent_files:
-
-        # Vérifiez si la colonne est valide
-        if adj_file in range(8):
-            adj_square = chess.square(adj_file, rank)
-            adj_piece = board.piece_at(adj_square)
-
-            # Vérifiez si le pion est supporté
-            if adj_piece is not None and adj_piece.piece_type == chess.PAWN and adj_piece.color == color:
-                return True
-
-    return False
-
-
-def evaluate_board(board, color):
-    """
-    Fonction heuristique permettant l'évaluation de l'état actuel d'un échiquier
-    :param board: État actuel de l'échiquier
-    :param color: Couleur du joueur actuel
-    :return: Score total d'évaluation de l'état actuel de l'échiquier
-    """
-
-    # Liste des cases centrales de l'échiquier
-    center_squares = [
-        chess.C4, chess.D4, chess.E4, chess.C5, chess.D5, chess.E5
-    ]
-
-    total_score = 0
-
-    # Valeurs et coefficients des pièces en fonction de la couleur du joueur actuel
-    values = PIECES_VALUES
-    coeff = development_coefficients
-
-    # Récupération des cases des pièces du joueur actuel sur l'échiquier
-    squares_pieces = (board.pieces(chess.PAWN, color) | board.pieces(chess.KNIGHT, color) |
-                      board.pieces(chess.BISHOP, color) | board.pieces(chess.ROOK, color) |
-                      board.pieces(chess.QUEEN, color) | board.pieces(chess.KING, color))
-
-    # Parcours des cases où se trouvent les pièces du joueur actuel
-    for square in squares_pieces:
-        # Récupération de la pièce se trouvant à la case actuelle
-        piece = board.piece_at(square)
-
-        if piece is not None:
-            # Récupération de la valeur associée à la pièce
-            piece_value = values.get(piece.piece_type, 0)
-
-            # Valorisation du développement des pièces
-            if (color == chess.WHITE and square < 16) or (color == chess.BLACK and square > 47):
-                if piece.piece_type == chess.KING:
-                    piece_value -= 1
-
-                    # Valorisation du roque
-                    if board.has_kingside_castling_rights(color) or board.has_queenside_castling_rights(color):
-                        piece_value += 1
-                else:
-                    piece_value += coeff[piece.piece_type] * (7 - chess.square_rank(square))
-
-            # Pénalité pour les pions isolés
-            if piece.piece_type == chess.PAWN:
-                if not is_pawn_supported(board, square, color):
-                    piece_value -= 1
-                if is_pawn_supported(board, square, color):
-                    piece_value += 1
-
-            # Ajout de la valeur de la pièce au score total
-            if piece.color == color:
-                total_score += piece_value
-            else:
-                total_score -= piece_value
-
-    # Contrôle du centre du plateau
-    center_control = 0
-    for square in center_squares:
-        if board.piece_at(square) is not None and board.piece_at(square).color == color:
-            center_control += 1
-        else:
-            center_control -= 1
-
-    total_score += center_control
-
-    # Défense du Roi
-    king_safety = 0
-    king_square = board.king(color)
-
-    if not board.is_attacked_by(color, king_square):
-        king_safety += 1
-    else:
-        king_safety -= 1
-
-    total_score += king_safety
-
-    return total_score
-
-
-def minimax_alpha_beta(board, color, depth, alpha, beta, maximizing_player):
-    """
-    Fonction d'évaluation minimax avec élagage alpha-bêta pour déterminer le meilleur coup à jouer
-    :param board: État actuel de l'échiquier
-    :param color: Couleur de l'ordinateur
-    :param depth: Profondeur de recherche de l'arbre de jeu
-    :param alpha: Valeur alpha pour l'élagage alpha-bêta
-    :param beta: Valeur bêta pour l'élagage alpha-bêta
-    :param maximizing_player: Booléen indiquant si le joueur actuel est le joueur maximisant(True) ou minimisant(False)
-    :return: Score d'évaluation du meilleur coup à jouer et le meilleur coup à jouer
-    """
-    if depth == 0 or board.is_game_over():
-        return evaluate_board(board, color), None
-
-    legal_moves = list(board.legal_moves)
-    if maximizing_player:
-        max_value = float('-inf')
-        best_move = None
-        for move in legal_moves:
-            board.push(move)
-            value, _ = minimax_alpha_beta(board, color, depth - 1, alpha, beta, False)
-            board.pop()
-            if value > max_value:
-                max_value = value
-                best_move = move
-            alpha = max(alpha, max_value)
-            if alpha >= beta:
-                break
-        return max_value, best_move
-    else:
-        min_value = float('inf')
-        best_move = None
-        for move in legal_moves:
-            board.push(move)
-            value, _ = minimax_alpha_beta(board, color, depth - 1, alpha, beta, True)
-            board.pop()
-            if value < min_value:
-                min_value = value
-                best_move = move
-            beta = min(beta, min_value)
-            if beta <= alpha:
-                break
-        return min_value, best_move
-
-
-def make_MINMAX_AI_move(board, depth, color):
-    """
-    Fonction permettant à l'ordinateur de jouer le meilleur coup selon l'algorithme minmax
-    :param board: État actuel de l'échiquier
-    :param depth: Profondeur de recherche de l'arbre de jeu
-    :param color: Couleur de l'ordinateur
-    :return: Échiquier avec le meilleur coup joué selon l'algorithme minmax
-    """
-
-    # Initialise les valeurs alpha et bêta pour l'élagage alpha-bêta
-    alpha = -float('inf')
-    beta = float('inf')
-
-    # Appel de la fonction minimax_alpha_beta pour déterminer le meilleur coup à jouer et sa valeur d'évaluation
-    value, best_move = minimax_alpha_beta(board, color, depth, alpha, beta, True)
-    # print("Color:", color, value, best_move)
-
-    # Création d'une copie de l'état actuel de l'échiquier
-    new_board = board.copy()
-
-    # Joue le meilleur coup déterminé par la fonction minimax_alpha_beta sur la copie de l'échiquier
-    new_board.push(best_move)
-
-    return new_board
-
-
 # ------------------------------- Bouton jouer, cadence et choix couleur et difficulté ------------------------------- #
 # Différentes couleurs du bouton jouer
 GREEN_PLAY = (4, 191, 98)  # Pour commencer une partie
@@ -781,10 +694,10 @@ RED_RESIGN = (244, 56, 40)  # Pour abandonner
 play_button_color = GREEN_PLAY
 
 # Définir la police pour le texte du bouton play
-play_font = pygame.font.SysFont("Arial", 32)
+play_font = get_font("Arial", 32)
 
 # Créer le texte du bouton play
-play_button = play_font.render('PLAY', True, BLACK)
+play_button = render_text('PLAY', play_font, BLACK)
 
 # Définir la position et les dimensions du bouton play
 dim_play_button = [4 * SQUARE_SIDE, play_button.get_height()]
@@ -806,10 +719,6 @@ BUTTON_WIDTH = 75
 BUTTON_HEIGHT = 50
 
 # Définir les positions des boutons pour le choix de couleur
-white_button_rect = None
-black_button_rect = None
-random_button_rect = None
-
 COLOR_CHOICE_BUTTON_X = pos_play_button[0]
 COLOR_CHOICE_BUTTON_Y = pos_play_button[1] + 0.75 * SQUARE_SIDE
 
@@ -818,6 +727,10 @@ POS_BLACK_CC = (COLOR_CHOICE_BUTTON_X + 2 * SQUARE_SIDE - BUTTON_WIDTH / 2, COLO
 POS_RANDOM_CC = (COLOR_CHOICE_BUTTON_X + 4 * SQUARE_SIDE - BUTTON_WIDTH, COLOR_CHOICE_BUTTON_Y)
 DIM_CC_BUTTON = (BUTTON_WIDTH, BUTTON_HEIGHT)
 
+white_button_rect = pygame.Rect(POS_WHITE_CC, DIM_CC_BUTTON)
+black_button_rect = pygame.Rect(POS_BLACK_CC, DIM_CC_BUTTON)
+random_button_rect = pygame.Rect(POS_RANDOM_CC, DIM_CC_BUTTON)
+
 # Charger les images pour les boutons
 white_cc_image = pygame.image.load('images/white_button.png')
 black_cc_image = pygame.image.load('images/black_button.png')
@@ -827,11 +740,10 @@ random_cc_image = pygame.image.load('images/random_button.jpg')
 def show_color_choice():
     # Fonction permettant l'affichage des couleurs des pièces
 
-    global white_button_rect, black_button_rect, random_button_rect
     # Dessiner les boutons sur la surface de l'écran
-    white_button_rect = pygame.draw.rect(SCREEN, WHITE, pygame.Rect(POS_WHITE_CC, DIM_CC_BUTTON))
-    black_button_rect = pygame.draw.rect(SCREEN, WHITE, pygame.Rect(POS_BLACK_CC, DIM_CC_BUTTON))
-    random_button_rect = pygame.draw.rect(SCREEN, WHITE, pygame.Rect(POS_RANDOM_CC, DIM_CC_BUTTON))
+    pygame.draw.rect(SCREEN, WHITE, white_button_rect)
+    pygame.draw.rect(SCREEN, WHITE, black_button_rect)
+    pygame.draw.rect(SCREEN, WHITE, random_button_rect)
 
     # Dessiner les images sur les boutons
     SCREEN.blit(white_cc_image, POS_WHITE_CC)
@@ -840,7 +752,7 @@ def show_color_choice():
 
 
 # Définir la police pour les cadences de jeu et les incrémentations
-tc_increment_font = pygame.font.SysFont("Arial", 24)
+tc_increment_font = get_font("Arial", 24)
 
 # Définir les cadences de jeu
 TIME_CONTROLS = [1, 3, 5, 15]
@@ -853,17 +765,22 @@ TC_BUTTON_Y = COLOR_CHOICE_BUTTON_Y + SQUARE_SIDE
 INCREMENT_BUTTON_X = TC_BUTTON_X
 INCREMENT_BUTTON_Y = TC_BUTTON_Y + 60
 
+# Rectangles des boutons des cadences et des incrémentations
+TC_BUTTON_RECTS = [pygame.Rect(TC_BUTTON_X + i * (BUTTON_WIDTH + 5), TC_BUTTON_Y, BUTTON_WIDTH, BUTTON_HEIGHT)
+                   for i in range(len(TIME_CONTROLS))]
+INCREMENT_BUTTON_RECTS = [pygame.Rect(INCREMENT_BUTTON_X + i * (BUTTON_WIDTH + 5), INCREMENT_BUTTON_Y, BUTTON_WIDTH,
+                                      BUTTON_HEIGHT) for i in range(len(INCREMENT_TIME))]
+
 
 def show_time_controls():
     # Fonction permettant l'affichage des cadences de jeu
 
     global initial_time
     # Dessiner les boutons pour les cadences de jeu
-    for i, time_control in enumerate(TIME_CONTROLS):
-        button_rect = pygame.draw.rect(SCREEN, WHITE, pygame.Rect(TC_BUTTON_X + i * (BUTTON_WIDTH + 5), TC_BUTTON_Y,
-                                                                  BUTTON_WIDTH, BUTTON_HEIGHT))
+    for time_control, button_rect in zip(TIME_CONTROLS, TC_BUTTON_RECTS):
+        pygame.draw.rect(SCREEN, WHITE, button_rect)
         pygame.draw.rect(SCREEN, GREY, button_rect, 2)
-        button_text = tc_increment_font.render(str(time_control) + "min", True, BLACK)
+        button_text = render_text(str(time_control) + "min", tc_increment_font, BLACK)
         button_text_rect = button_text.get_rect(center=button_rect.center)
         SCREEN.blit(button_text, button_text_rect)
 
@@ -881,11 +798,10 @@ def show_increment_time():
 
     global increment
     # Dessiner les boutons pour les incrémentations
-    for i, increment_time in enumerate(INCREMENT_TIME):
-        button_rect = pygame.draw.rect(SCREEN, WHITE, pygame.Rect(INCREMENT_BUTTON_X + i * (BUTTON_WIDTH + 5),
-                                                                  INCREMENT_BUTTON_Y, BUTTON_WIDTH, BUTTON_HEIGHT))
+    for increment_time, button_rect in zip(INCREMENT_TIME, INCREMENT_BUTTON_RECTS):
+        pygame.draw.rect(SCREEN, WHITE, button_rect)
         pygame.draw.rect(SCREEN, GREY, button_rect, 2)
-        button_text = tc_increment_font.render(str(increment_time) + "sec", True, BLACK)
+        button_text = render_text(str(increment_time) + "sec", tc_increment_font, BLACK)
         button_text_rect = button_text.get_rect(center=button_rect.center)
         SCREEN.blit(button_text, button_text_rect)
 
@@ -898,7 +814,7 @@ def show_increment_time():
 
 
 # Définir la police pour la difficulté
-difficulty_font = pygame.font.SysFont("Comic Sans MS", 24)
+difficulty_font = get_font("Comic Sans MS", 24)
 
 # Définir les cadences de jeu
 TIME_CONTROLS = [1, 3, 5, 15]
@@ -908,59 +824,30 @@ INCREMENT_TIME = [1, 2, 5, 10]
 DIFFICULTY_BUTTON_X = INCREMENT_BUTTON_X
 DIFFICULTY_BUTTON_Y = INCREMENT_BUTTON_Y + 70
 
-easy_rect = None
-hard_rect = None
+# Rectangles des boutons de difficulté, placés après le texte « Difficulty : »
+difficulty_text = render_text("Difficulty :", difficulty_font, BLACK)
+easy_text = render_text("Easy", difficulty_font, BLACK)
+hard_text = render_text("Hard", difficulty_font, BLACK)
+easy_rect = pygame.Rect(DIFFICULTY_BUTTON_X + difficulty_text.get_width() + 10, DIFFICULTY_BUTTON_Y,
+                        easy_text.get_width() + 20, easy_text.get_height())
+hard_rect = pygame.Rect(DIFFICULTY_BUTTON_X + difficulty_text.get_width() + easy_text.get_width() + 40,
+                        DIFFICULTY_BUTTON_Y, hard_text.get_width() + 20, hard_text.get_height())
 
 
 def show_difficulty_button():
-    # Fonction permettant l'affichage des difficultés
-
-    global easy_rect, hard_rect, difficulty
-
-    difficulty_text = difficulty_font.render("Difficulty :", True, BLACK)
+    # Fonction permettant l'affichage des difficultés, la difficulté choisie étant encadrée en rouge
     SCREEN.blit(difficulty_text, (DIFFICULTY_BUTTON_X, DIFFICULTY_BUTTON_Y))
 
-    if difficulty == "easy":
-        easy_text = difficulty_font.render("Easy", True, BLACK)
-        easy_rect = pygame.draw.rect(SCREEN, (255, 0, 0),
-                         (DIFFICULTY_BUTTON_X + difficulty_text.get_width() + 10, DIFFICULTY_BUTTON_Y,
-                          easy_text.get_width() + 20, easy_text.get_height()), 2)
-        SCREEN.blit(easy_text, (DIFFICULTY_BUTTON_X + difficulty_text.get_width() + 20, DIFFICULTY_BUTTON_Y))
-        hard_text = difficulty_font.render("Hard", True, BLACK)
-        hard_rect = pygame.draw.rect(SCREEN, GREY,
-                                     (DIFFICULTY_BUTTON_X + difficulty_text.get_width() + easy_text.get_width() + 40,
-                                      DIFFICULTY_BUTTON_Y,
-                                      hard_text.get_width() + 20, hard_text.get_height()), 2)
-        SCREEN.blit(hard_text, (
-        DIFFICULTY_BUTTON_X + difficulty_text.get_width() + easy_text.get_width() + 50, DIFFICULTY_BUTTON_Y))
-    else:
-        easy_text = difficulty_font.render("Easy", True, BLACK)
-        easy_rect = pygame.draw.rect(SCREEN, GREY,
-                         (DIFFICULTY_BUTTON_X + difficulty_text.get_width() + 10, DIFFICULTY_BUTTON_Y,
-                          easy_text.get_width() + 20, easy_text.get_height()), 2)
-        SCREEN.blit(easy_text, (DIFFICULTY_BUTTON_X + difficulty_text.get_width() + 20, DIFFICULTY_BUTTON_Y))
-
-        hard_text = difficulty_font.render("Hard", True, BLACK)
-        hard_rect = pygame.draw.rect(SCREEN, (255, 0, 0),
-                         (DIFFICULTY_BUTTON_X + difficulty_text.get_width() + easy_text.get_width() + 40, DIFFICULTY_BUTTON_Y,
-                          hard_text.get_width() + 20, hard_text.get_height()), 2)
-        SCREEN.blit(hard_text, (DIFFICULTY_BUTTON_X + difficulty_text.get_width() + easy_text.get_width() + 50, DIFFICULTY_BUTTON_Y))
-
-
-def is_on_easy_difficulty(event):
-    if easy_rect.collidepoint(event.pos):
-        return True
-    return False
+    pygame.draw.rect(SCREEN, (255, 0, 0) if difficulty == "easy" else GREY, easy_rect, 2)
+    SCREEN.blit(easy_text, (easy_rect.x + 10, DIFFICULTY_BUTTON_Y))
 
+    pygame.draw.rect(SCREEN, (255, 0, 0) if difficulty == "hard" else GREY, hard_rect, 2)
+    SCREEN.blit(hard_text, (hard_rect.x + 10, DIFFICULTY_BUTTON_Y))
 
-def is_on_hard_difficulty(event):
-    if hard_rect.collidepoint(event.pos):
-        return True
-    return False
 
 # ---------------------------------------------------- Pendules  ---------------------------------------------------- #
 # Définir la police pour les pendules
-clock_font = pygame.font.SysFont("Arial", 30)
+clock_font = get_font("Arial", 30)
 
 # Définir les positions des horloges
 dim_clock = [0, 0]
@@ -971,43 +858,86 @@ pos_clock_downboard = (GRID_X + 8 * SQUARE_SIDE - dim_clock[0], GRID_Y + 8 * SQU
 initial_time = 180
 increment = 2  # Incrémentation
 
-# Définir le temps restant pour chaque horloge
-remaining_timeW = initial_time
-remaining_timeB = initial_time
-
-# Booléen définissant si c'est la pendule blanche ou noire qui doit décrémenter
-pauseW = True
-pauseB = True
-has_time = True  # Booléen pour savoir si un des deux joueurs n'a plus de temps
-
-
-def white_clock():
-    # Fonction pour la pendule des pièces blanches
-    global remaining_timeW, pauseW, has_time
-    while has_time:
-        time.sleep(1)
-        if not pauseW:
-            remaining_timeW -= 1
-            if remaining_timeW <= 0:
-                has_time = False
-
-
-def black_clock():
-    # Fonction pour la pendule des pièces noires
-    global remaining_timeB, pauseB, has_time
-    while has_time:
-        time.sleep(1)
-        if not pauseB:
-            remaining_timeB -= 1
-            if remaining_timeB <= 0:
-                has_time = False
 
+class GameClock:
+    """
+    Pendules de la partie. Le temps restant de chaque joueur est calculé à la demande à partir de time.monotonic() :
+    aucun fil d'exécution ne tourne en arrière-plan et la précision est celle de l'horloge du système, quelle que soit
+    la charge du processeur.
+    """
 
-# Création des threads pour les pendules
-thread_white_clock = threading.Thread(target=white_clock)
-thread_white_clock.start()
-thread_black_clock = threading.Thread(target=black_clock)
-thread_black_clock.start()
+    def __init__(self, initial_time):
+        self.reset(initial_time)
+
+    def reset(self, initial_time):
+        # Remet les deux pendules au temps initial et les arrête
+        self.remaining = {chess.WHITE: float(initial_time), chess.BLACK: float(initial_time)}
+        self.running = None  # Couleur dont la pendule tourne (None : pendules arrêtées)
+        self.started = 0.0  # Instant où la pendule en marche a été lancée
+
+    def remaining_time(self, color):
+        # Temps restant d'un joueur en secondes, y compris le temps écoulé depuis le lancement de sa pendule
+        remaining = self.remaining[color]
+        if self.running == color:
+            remaining -= time.monotonic() - self.started
+        return max(remaining, 0.0)
+
+    def start(self, color):
+        # Lance la pendule d'un joueur, celle de l'adversaire est arrêtée
+        self.stop()
+        self.running = color
+        self.started = time.monotonic()
+
+    def stop(self):
+        # Arrête la pendule en marche en lui décomptant le temps écoulé
+        if self.running is not None:
+            self.remaining[self.running] = self.remaining_time(self.running)
+            self.running = None
+
+    def press(self, color, increment):
+        """
+        Fonction appelée lorsqu'un joueur a joué son coup : sa pendule est arrêtée, l'incrémentation lui est ajoutée,
+        puis la pendule de l'adversaire est lancée
+        :param color: Couleur du joueur qui vient de jouer
+        :param increment: Incrémentation ajoutée après chaque coup (en secondes)
+        """
+        self.stop()
+        self.remaining[color] += increment
+        self.start(not color)
+
+    def take_back(self, color, increment):
+        """
+        Fonction appelée lorsque le dernier coup d'un joueur est annulé : l'incrémentation reçue pour ce coup lui est
+        retirée et sa pendule est relancée, celle de l'adversaire est arrêtée
+        :param color: Couleur du joueur dont le coup est annulé
+        :param increment: Incrémentation ajoutée après chaque coup (en secondes)
+        """
+        self.stop()
+        self.remaining[color] -= increment
+        self.start(color)
+
+    def flag(self):
+        # Couleur du joueur dont le temps est écoulé (None si les deux joueurs ont encore du temps)
+        for color in (chess.WHITE, chess.BLACK):
+            if self.remaining_time(color) <= 0:
+                return color
+        return None
+
+    def display(self, color):
+        # Temps affiché d'un joueur, en secondes entières : 0:00 n'apparaît qu'une fois le temps écoulé
+        return math.ceil(self.remaining_time(color))
+
+    def time_to_next_second(self):
+        # Durée en secondes avant le prochain changement du temps affiché (None si les pendules sont arrêtées)
+        if self.running is None:
+            return None
+        remaining = self.remaining_time(self.running)
+        return remaining - math.ceil(remaining) + 1
+
+
+# Pendules de la partie
+game_clock = GameClock(initial_time)
+has_time = True  # Booléen pour savoir si un des deux joueurs n'a plus de temps
 
 
 def convert_seconds(secondes):
@@ -1023,7 +953,7 @@ def show_text(texte, couleur, surface, x, y):
     # Fonction pour afficher le texte du minuteur
     global dim_clock
 
-    texte_objet = clock_font.render(texte, True, couleur)
+    texte_objet = render_text(texte, clock_font, couleur)
     dim_clock = [texte_objet.get_width() + 40, clock_font.get_height()]
     texture_rect = texte_objet.get_rect()
     texture_rect.topleft = (x, y)
@@ -1039,8 +969,8 @@ def show_clock(color):
     pygame.draw.rect(SCREEN, LICHESS_GRAY_LIGHT,
                      pygame.Rect((pos_clock_downboard[0] - dim_clock[0], pos_clock_downboard[1]), dim_clock))
 
-    texteW = convert_seconds(remaining_timeW)  # Conversion des secondes en minutes et secondes pour les blancs
-    texteB = convert_seconds(remaining_timeB)  # Conversion des secondes en minutes et secondes pour les noirs
+    texteW = convert_seconds(game_clock.display(chess.WHITE))  # Conversion en minutes et secondes pour les blancs
+    texteB = convert_seconds(game_clock.display(chess.BLACK))  # Conversion en minutes et secondes pour les noirs
 
     # Selon la couleur de l'utilisateur, la pendule blanche sera soit en haut ou en bas de l'écran
     if color == chess.WHITE:
@@ -1054,55 +984,205 @@ def show_clock(color):
         show_text(texteB, BLACK, SCREEN, pos_clock_downboard[0] - dim_clock[0] + 20, pos_clock_downboard[1])
 
 
+def compute_move_time(color):
+    """
+    Fonction calculant le temps de réflexion alloué à l'ordinateur pour son prochain coup
+    :param color: Couleur de l'ordinateur
+    :return: Temps de réflexion en secondes
+    """
+
+    return allocate_move_time(game_clock.remaining_time(color), increment, initial_time)
+
+
 def update_time(color):
-    # Fonction permettant de gérer le temps des pendules selon quel joueur joue
+    # Fonction permettant de gérer le temps des pendules selon quel joueur joue : le joueur qui vient de jouer reçoit
+    # l'incrémentation et la pendule de son adversaire est lancée
+    game_clock.press(color, increment)
+
+
+# -------------------------------------------- Rendu des zones modifiées -------------------------------------------- #
+# Zones de l'écran redessinées indépendamment les unes des autres : chaque zone est effacée puis redessinée
+# uniquement si son contenu a changé, et seuls ses rectangles sont envoyés à l'écran
+BOARD_RECT = pygame.Rect(GRID_X, GRID_Y, 8 * SQUARE_SIDE, 8 * SQUARE_SIDE)
+SCORE_HEIGHT = get_font("Comic Sans MS", 22).get_height()
+REGION_RECTS = {
+    "panel": [pygame.Rect(0, GRID_Y, pos_play_button[0] + dim_play_button[0] + 10,
+                          DIFFICULTY_BUTTON_Y + difficulty_font.get_height() + 10 - GRID_Y)],
+    "stats": [pygame.Rect(0, DIFFICULTY_BUTTON_Y + 70, pos_play_button[0] + dim_play_button[0] + 10,
+                          2 * SQUARE_SIDE)],
+    "score": [pygame.Rect(GRID_X, GRID_Y - SCORE_HEIGHT, 4 * SQUARE_SIDE, SCORE_HEIGHT),
+              pygame.Rect(GRID_X, GRID_Y + 8 * SQUARE_SIDE, 4 * SQUARE_SIDE, SCORE_HEIGHT)],
+    "clock": [pygame.Rect(GRID_X + 5 * SQUARE_SIDE, pos_clock_upboard[1], 3 * SQUARE_SIDE, clock_font.get_height()),
+              pygame.Rect(GRID_X + 5 * SQUARE_SIDE, pos_clock_downboard[1], 3 * SQUARE_SIDE,
+                          clock_font.get_height())],
+    "move_stack": [pygame.Rect(GRID_X + 8 * SQUARE_SIDE + 10, GRID_Y + 1.5 * SQUARE_SIDE,
+                               SCREEN_WIDTH - (GRID_X + 8 * SQUARE_SIDE + 10),
+                               SCREEN_HEIGHT - (GRID_Y + 1.5 * SQUARE_SIDE))],
+}
 
-    global pauseW, remaining_timeW, pauseB, remaining_timeB, increment
+# Sur un écran trop étroit, le panneau de gauche chevauche l'échiquier : toute modification redessine alors l'écran
+REGIONS_OVERLAP = any(rect.colliderect(BOARD_RECT) for rects in REGION_RECTS.values() for rect in rects)
 
-    if color == chess.WHITE:
-        pauseW = True
-        pauseB = False
-        remaining_timeW += increment
-    else:
-        pauseB = True
-        pauseW = False
-        remaining_timeB += increment
+full_redraw = True  # L'écran entier doit être redessiné au prochain rafraîchissement
+drawn_squares = None  # États des cases de l'échiquier lors du dernier affichage
+drawn_regions = {}  # États des zones de l'écran lors du dernier affichage
+
+
+def request_full_redraw():
+    # Fonction demandant que l'écran entier soit redessiné au prochain rafraîchissement (après un panneau superposé)
+    global full_redraw
+    full_redraw = True
+
+
+def paint_region(name, board, color, white_score, black_score, clear=True):
+    """
+    Fonction effaçant puis redessinant une zone de l'écran
+    :param name: Nom de la zone dans REGION_RECTS
+    :param board: État actuel de l'échiquier
+    :param color: Couleur des pièces de l'utilisateur
+    :param white_score: Score des blancs
+    :param black_score: Score des noirs
+    :param clear: Effacement préalable de la zone (inutile lorsque l'écran entier vient d'être effacé)
+    :return: Rectangles de la zone redessinée
+    """
+    rects = REGION_RECTS[name]
+    if clear:
+        for rect in rects:
+            SCREEN.fill(WHITE, rect)
+
+    if name == "panel":
+        show_play_button()  # Affichage du bouton play
+        show_color_choice()  # Affichage des boutons pour le choix de la couleur des pièces
+        show_time_controls()  # Affichage des cadences de jeu
+        show_increment_time()  # Affichage des incrémentations
+        show_difficulty_button()  # Affichage des difficultés
+    elif name == "stats":
+        if display_search_stats and search_stats is not None:
+            show_search_stats(search_stats)  # Affichage des statistiques de la dernière recherche
+    elif name == "score":
+        show_score(color, white_score, black_score)  # Affichage du score
+    elif name == "clock":
+        show_clock(color)  # Affichage des pendules
+    elif name == "move_stack":
+        show_move_stack(board)  # Affichage de l'historique des coups
+
+    return rects
+
+
+# ------------------------------------------------ Zones cliquables ------------------------------------------------- #
+# Index spatial des zones cliquables : l'écran est découpé en cellules, chacune listant les zones qui la recouvrent.
+# Un clic ne teste donc que les quelques zones de sa cellule. Les zones ajoutées en premier sont prioritaires
+HIT_CELL_SIZE = 64  # Côté d'une cellule de l'index (en pixels)
+hit_index = {}  # Zones par cellule : {(colonne, rangée): [(rectangle, nom, valeur)]}
+
+
+def add_hit_zone(rect, name, value=None):
+    """
+    Fonction ajoutant une zone cliquable à l'index
+    :param rect: Rectangle de la zone sur l'écran
+    :param name: Nom de la zone renvoyé par hit_test
+    :param value: Valeur associée à la zone (cadence, incrémentation, difficulté, couleur, ...)
+    """
+    rect = pygame.Rect(rect)
+    for cell_x in range(rect.left // HIT_CELL_SIZE, (rect.right - 1) // HIT_CELL_SIZE + 1):
+        for cell_y in range(rect.top // HIT_CELL_SIZE, (rect.bottom - 1) // HIT_CELL_SIZE + 1):
+            hit_index.setdefault((cell_x, cell_y), []).append((rect, name, value))
+
+
+def hit_test(pos):
+    """
+    Fonction cherchant la zone cliquable située sous un point de l'écran
+    :param pos: Coordonnées du point (position de la souris)
+    :return: Nom et valeur de la zone, (None, None) si le point n'est dans aucune zone
+    """
+    for rect, name, value in hit_index.get((pos[0] // HIT_CELL_SIZE, pos[1] // HIT_CELL_SIZE), ()):
+        if rect.collidepoint(pos):
+            return name, value
+    return None, None
+
+
+add_hit_zone((pos_exit_button, exit_button.get_size()), "exit")
+add_hit_zone((pos_change_theme_button, (40, 40)), "theme")
+add_hit_zone((pos_reset_score_button, (40, 40)), "reset_score")
+add_hit_zone(play_button_rect, "play")
+add_hit_zone(white_button_rect, "color", chess.WHITE)
+add_hit_zone(black_button_rect, "color", chess.BLACK)
+add_hit_zone(random_button_rect, "color")
+for button_rect, time_control in zip(TC_BUTTON_RECTS, TIME_CONTROLS):
+    add_hit_zone(button_rect, "time_control", time_control * 60)
+for button_rect, increment_time in zip(INCREMENT_BUTTON_RECTS, INCREMENT_TIME):
+    add_hit_zone(button_rect, "increment", increment_time)
+add_hit_zone(easy_rect, "difficulty", "easy")
+add_hit_zone(hard_rect, "difficulty", "hard")
+add_hit_zone(REGION_RECTS["move_stack"][0], "move_list")
+add_hit_zone(BOARD_RECT, "board")  # En dernier : sur un écran étroit, les boutons chevauchant l'échiquier passent avant
 
 
 # ----------------------------------------------- Programme principale ----------------------------------------------- #
 selected = False
 difficulty = "easy"
+search_stats = None  # Statistiques de la dernière recherche de l'ordinateur
+display_search_stats = False  # Affichage des statistiques de recherche dans la fenêtre (touche s)
+search_log_path = None  # Journal des statistiques des recherches (option --search-log, None pour ne rien enregistrer)
 
 
 def refresh(board, color, selected_square, white_score, black_score):
-    # Fonction permettant le rafraichissement de l'interface graphique et de tous ses élements
+    """
+    Fonction permettant le rafraichissement de l'interface graphique et de tous ses élements.
+    Seules les cases et les zones dont le contenu a changé depuis le dernier rafraîchissement sont redessinées puis
+    envoyées à l'écran. L'écran entier n'est redessiné qu'au premier affichage, après un panneau superposé et lors
+    d'un changement de thème ou d'orientation de l'échiquier.
+    """
 
-    global selected, difficulty
+    global selected, difficulty, full_redraw, drawn_squares, drawn_regions
+
+    # Contenu de chaque zone : une zone n'est redessinée que si son contenu a changé
+    regions = {
+        "view": (BOARD_COLOR, color),
+        "panel": (play_button_color, play_button.get_size(), difficulty, initial_time, increment),
+        "stats": (display_search_stats,
+                  search_stats.summary() if display_search_stats and search_stats is not None else None),
+        "score": (white_score, black_score, color),
+        "clock": (game_clock.display(chess.WHITE), game_clock.display(chess.BLACK), color),
+        "move_stack": (len(board.move_stack), board.move_stack[-1] if board.move_stack else None,
+                       move_list_scroll),
+    }
+    changed = [name for name in REGION_RECTS if regions[name] != drawn_regions.get(name)]
+    if regions["view"] != drawn_regions.get("view"):
+        full_redraw = True
+    drawn_regions = regions
 
-    if selected:
-        print_board(board, color, selected_square)  # Affichage des coups légaux pour la case sélectionnée
-    else:
-        print_board(board, color)  # Affichage de l'échiquier
+    # Affichage de l'échiquier, avec les coups légaux de la case sélectionnée
+    shown_square = selected_square if selected else None
+
+    if not full_redraw:
+        drawn_squares, dirty_rects = print_board(board, color, shown_square, drawn_squares)
+
+        # Si des zones se chevauchent, l'ordre de dessin compte : l'écran entier est alors redessiné
+        if not REGIONS_OVERLAP or not (dirty_rects or changed):
+            for name in changed:
+                dirty_rects += paint_region(name, board, color, white_score, black_score)
+
+            if dirty_rects:
+                pygame.display.update(dirty_rects)  # Mise à jour des seules zones modifiées
+            return
+
+    full_redraw = False
+    SCREEN.fill(WHITE)  # Remplissage de l'écran avec la couleur blanche
+    drawn_squares, _ = print_board(board, color, shown_square)
 
     show_title()  # Affichage du titre
-    SCREEN.blit(pygame.transform.scale(logo_upjv, (125, 136)), (0, 0))  # Affichage du logo de l'UPJV
+    SCREEN.blit(get_sprite(logo_upjv, (125, 136)), (0, 0))  # Affichage du logo de l'UPJV
     SCREEN.blit(exit_button, (SCREEN_WIDTH - SQUARE_SIDE, 20))  # Affichage du bouton exit
 
-    show_play_button()  # Affichage du bouton play
-    show_color_choice()  # Affichage des boutons pour le choix de la couleur des pièces
-    show_time_controls()  # Affichage des cadences de jeu
-    show_increment_time()  # Affichage des incrémentations
-    show_difficulty_button()  # Affichage des difficultés
-
-    show_score(color, white_score, black_score)  # Affichage du score
-    show_clock(color)  # Affichage des pendules
-    show_move_stack(board)  # Affichage de l'historique des coups
+    for name in REGION_RECTS:
+        paint_region(name, board, color, white_score, black_score, clear=False)
 
     # Affichage du bouton pour changer le thème de l'échiquier
-    SCREEN.blit(pygame.transform.scale(change_theme_button, (40, 40)), pos_change_theme_button)
+    SCREEN.blit(get_sprite(change_theme_button, (40, 40)), pos_change_theme_button)
 
     # Affichage du bouton pour reset les scores
-    SCREEN.blit(pygame.transform.scale(reset_score_button, (40, 40)), pos_reset_score_button)
+    SCREEN.blit(get_sprite(reset_score_button, (40, 40)), pos_reset_score_button)
 
     pygame.display.flip()  # Mis à jour de la fenêtre graphique
 
@@ -1110,15 +1190,15 @@ def refresh(board, color, selected_square, white_score, black_score):
 def play_as(board, color):
     global BOARD_COLOR, play_button, play_button_color
     global selected
-    global pauseW, pauseB, remaining_timeW, remaining_timeB, initial_time, increment
-    global thread_white_clock, thread_black_clock, has_time
-    global white_button_rect, black_button_rect, random_button_rect
+    global initial_time, increment, has_time
+    global search_stats, display_search_stats
     run = True
     lance = ongoing = False
     leaving_square = arriving_square = selected_square = None
     white_score = black_score = 0
     has_resigned = False
     second_click = False
+    search = None  # Recherche de l'ordinateur en arrière-plan
     global difficulty
 
     opposing_color = chess.BLACK if color == chess.WHITE else chess.WHITE
@@ -1127,16 +1207,11 @@ def play_as(board, color):
         while run:
             CLOCK.tick(CLOCK_TICK)
 
-            # Si le temps s'est écoulé pour l'une des deux pendules, il faut relancer un thread
-            if not thread_white_clock.is_alive():
-                thread_white_clock = threading.Thread(target=white_clock)
-                thread_white_clock.start()
-
-            if not thread_black_clock.is_alive():
-                thread_black_clock = threading.Thread(target=black_clock)
-                thread_black_clock.start()
+            # Le temps de l'un des deux joueurs est écoulé
+            if ongoing and game_clock.flag() is not None:
+                has_time = False
 
-            if pauseW == pauseB:
+            if game_clock.running is None:
                 if has_resigned:
                     play_button_color = LICHESS_GRAY_LIGHT
                 else:
@@ -1145,79 +1220,67 @@ def play_as(board, color):
                 play_button_color = RED_RESIGN
 
             if play_button_color == GREEN_PLAY:
-                play_button = play_font.render('PLAY', True, BLACK)
+                play_button = render_text('PLAY', play_font, BLACK)
             elif play_button_color == RED_RESIGN:
-                play_button = play_font.render('RESIGN', True, BLACK)
+                play_button = render_text('RESIGN', play_font, BLACK)
             elif play_button_color == LICHESS_GRAY_LIGHT:
-                play_button = play_font.render('PLAY AGAIN', True, BLACK)
+                play_button = render_text('PLAY AGAIN', play_font, BLACK)
 
             refresh(board, color, selected_square, white_score, black_score)
 
             while lance is False:
 
-                for event in pygame.event.get():
+                # Menu : la boucle est endormie jusqu'au prochain événement
+                for event in wait_events():
                     if event.type == pygame.QUIT:
                         lance = True
                         has_time = run = False
 
                     if event.type == pygame.MOUSEMOTION:
                         # Vérifier si la souris est sur le bouton play
-                        if is_on_play_button(event):
+                        if hit_test(event.pos)[0] == "play":
                             play_button_color = RED_RESIGN
                         else:
                             play_button_color = GREEN_PLAY
 
                     if event.type == pygame.MOUSEBUTTONDOWN:
+                        zone, value = hit_test(event.pos)
+
                         # Exit
-                        if (pos_exit_button[0] <= event.pos[0] <= pos_exit_button[0] + exit_button.get_width()
-                                and pos_exit_button[1] <= event.pos[1] <= pos_exit_button[1] + exit_button.get_height()):
+                        if zone == "exit":
                             lance = True
                             has_time = run = False
 
                         # Changer le thème de l'échiquier
-                        if (pos_change_theme_button[0] <= event.pos[0] <= pos_change_theme_button[0] + 40
-                                and pos_change_theme_button[1] <= event.pos[1] <= pos_change_theme_button[1] + 40):
+                        if zone == "theme":
                             new_colors = deepcopy(BOARD_COLORS)
                             new_colors.remove(BOARD_COLOR)
                             BOARD_COLOR = choice(new_colors)
 
-                        if (pos_reset_score_button[0] <= event.pos[0] <= pos_reset_score_button[0] + 40
-                                and pos_reset_score_button[1] <= event.pos[1] <= pos_reset_score_button[1] + 40):
+                        if zone == "reset_score":
                             white_score = black_score = 0
 
-                        if is_on_easy_difficulty(event):
-                            difficulty = "easy"
-
-                        if is_on_hard_difficulty(event):
-                            difficulty = "hard"
+                        if zone == "difficulty":
+                            difficulty = value
 
                         # Vérifier si le clic est dans la zone du bouton play
-                        if is_on_play_button(event):
+                        if zone == "play":
                             # Lancer la partie
                             lance = ongoing = True
-                            pauseW = False
+                            game_clock.start(chess.WHITE)
 
                         # Sélection de la cadence de jeu
-                        for i, time_control in enumerate(TIME_CONTROLS):
-                            if TC_BUTTON_X + i * (BUTTON_WIDTH + 5) <= event.pos[0] <= TC_BUTTON_X + (i + 1) * (
-                                    BUTTON_WIDTH + 5) and TC_BUTTON_Y <= event.pos[1] <= TC_BUTTON_Y + BUTTON_HEIGHT:
-                                initial_time = time_control * 60
-                                remaining_timeW = remaining_timeB = initial_time
+                        if zone == "time_control":
+                            initial_time = value
+                            game_clock.reset(initial_time)
 
                         # Sélection de l'incrémentation
-                        for i, increment_time in enumerate(INCREMENT_TIME):
-                            if (INCREMENT_BUTTON_X + i * (BUTTON_WIDTH + 5) <= event.pos[0] <= INCREMENT_BUTTON_X +
-                                    (i + 1) * (BUTTON_WIDTH + 5)
-                                    and INCREMENT_BUTTON_Y <= event.pos[1] <= INCREMENT_BUTTON_Y + BUTTON_HEIGHT):
-                                increment = increment_time
-
-                        # Sélection de la couleur des pièces
-                        if white_button_rect.collidepoint(event.pos):
-                            color = chess.WHITE
-                        elif black_button_rect.collidepoint(event.pos):
-                            color = chess.BLACK
-                        elif random_button_rect.collidepoint(event.pos):
-                            color = random.choice([chess.WHITE, chess.BLACK])
+                        if zone == "increment":
+                            increment = value
+
+                        # Sélection de la couleur des pièces (None : couleur aléatoire)
+                        if zone == "color":
+                            color = random.choice([chess.WHITE, chess.BLACK]) if value is None else value
 
                         tmp = swap_color(color)
                         if tmp != opposing_color:
@@ -1239,7 +1302,7 @@ def play_as(board, color):
                         # Lancer la partie
                         if event.key == 108:  # l key
                             lance = ongoing = True
-                            pauseW = False
+                            game_clock.start(chess.WHITE)
 
                         # Changer la couleur des pièces jouées
                         if event.key == 114:  # r key
@@ -1250,49 +1313,97 @@ def play_as(board, color):
                 refresh(board, color, selected_square, white_score, black_score)
 
             if not has_time and ongoing:
+                search = cancel_search(search)
                 has_resigned = True
                 ongoing, white_score, black_score = loose_on_time(ongoing, white_score, black_score)
                 board.push(chess.Move.null())  # Ajout du coup null pour signifier la fin de partie
                 refresh(board, color, selected_square, white_score, black_score)
 
             if has_time and ongoing and board.is_game_over():  # Fin de partie
+                search = cancel_search(search)
                 tmp_white, tmp_black = get_scores(board.result())
                 white_score += tmp_white
                 black_score += tmp_black
-                has_resigned = pauseW = pauseB = True
+                has_resigned = True
+                game_clock.stop()
                 refresh(board, color, selected_square, white_score, black_score)
                 ongoing = False
 
+            computer_moved = False  # L'ordinateur a joué pendant ce tour de boucle
             if has_time and ongoing and board.turn == opposing_color:  # Tour de l'ordinateur
                 if difficulty == "easy" :
                     board = make_random_AI_move(board)
+                    update_time(opposing_color)
+                    computer_moved = True
                 elif difficulty == "hard":
-                    board = make_MINMAX_AI_move(board, 4, opposing_color)
-                update_time(opposing_color)
+                    if search is not None and search.pondering:
+                        if search.board.fen() == board.fen():
+                            # L'utilisateur a joué le coup attendu : la recherche anticipée se poursuit
+                            search.ponderhit(compute_move_time(opposing_color))
+                        else:
+                            search = cancel_search(search)
+
+                    if search is None:
+                        # La recherche tourne en arrière-plan, l'interface continue d'être rafraîchie
+                        search = SearchHandle(board, MAX_SEARCH_DEPTH, opposing_color,
+                                              compute_move_time(opposing_color))
+                    elif search.done():
+                        new_board = search.result()
+                        stats = search.stats
+                        search = None
+                        if new_board is not None:
+                            board = new_board
+                            update_time(opposing_color)
+                            computer_moved = True
+
+                            # Statistiques de la recherche : journal et affichage
+                            search_stats = stats
+                            log_search_stats(stats, search_log_path)
+
+                            # Anticipation de la réponse de l'utilisateur pendant qu'il réfléchit
+                            if PONDER:
+                                search = start_ponder(board, opposing_color)
+
+            # La pendule de l'utilisateur tourne dès le coup de l'ordinateur : ce coup est affiché sans attendre
+            if computer_moved:
+                refresh(board, color, selected_square, white_score, black_score)
 
-            for event in pygame.event.get():
+            # L'ordinateur doit jouer ou vient de jouer : les événements sont relevés sans attendre, à la cadence de
+            # CLOCK_TICK, pour que son coup soit affiché aussitôt. Sinon la boucle est endormie jusqu'au prochain
+            # événement ou jusqu'au changement de la seconde affichée
+            if computer_moved or (has_time and ongoing and board.turn == opposing_color):
+                events = pygame.event.get()
+            else:
+                next_second = game_clock.time_to_next_second() if ongoing else None
+                if next_second is None:
+                    events = wait_events()
+                else:
+                    # Le délai est d'au moins 1 ms : pygame.event.wait(0) attendrait indéfiniment
+                    events = wait_events(min(IDLE_TIMEOUT, math.ceil(1000 * next_second) + 1))
+
+            for event in events:
                 if event.type == pygame.QUIT:
                     has_time = run = False
 
                 if event.type == pygame.MOUSEBUTTONDOWN:
+                    zone, _ = hit_test(event.pos)
+
                     # Exit
-                    if (pos_exit_button[0] <= event.pos[0] <= pos_exit_button[0] + exit_button.get_width()
-                            and pos_exit_button[1] <= event.pos[1] <= pos_exit_button[1] + exit_button.get_height()):
+                    if zone == "exit":
                         lance = True
                         has_time = run = False
 
                     # Changer le thème de l'échiquier
-                    if (pos_change_theme_button[0] <= event.pos[0] <= pos_change_theme_button[0]
-                            + change_theme_button.get_width() and pos_change_theme_button[1] <= event.pos[1]
-                            <= pos_change_theme_button[1] + 40):
+                    if zone == "theme":
                         new_colors = deepcopy(BOARD_COLORS)
                         new_colors.remove(BOARD_COLOR)
                         BOARD_COLOR = choice(new_colors)
 
-                    if is_on_play_button(event):
+                    if zone == "play":
+                        search = cancel_search(search)
                         if not ongoing:
                             # Nouvelle partie
-                            remaining_timeW = remaining_timeB = initial_time
+                            game_clock.reset(initial_time)
                             board = chess.Board()
                             lance = False
                             has_resigned = False
@@ -1306,14 +1417,14 @@ def play_as(board, color):
                             board.push(chess.Move.null())  # Ajout du coup null pour signifier la fin de partie
                             refresh(board, color, selected_square, white_score, black_score)
 
-                    if is_in_board():
+                    if zone == "board":
                         if not second_click:
-                            leaving_square = coord2str(event.pos, color)
+                            leaving_square = square_at(event.pos, color)
                             selected_square = leaving_square
 
                 if event.type == pygame.MOUSEBUTTONUP:
-                    if is_in_board():
-                        arriving_square = coord2str(event.pos, color)
+                    if hit_test(event.pos)[0] == "board":
+                        arriving_square = square_at(event.pos, color)
 
                     if leaving_square is not None and arriving_square is not None:
                         if leaving_square == arriving_square:
@@ -1328,11 +1439,12 @@ def play_as(board, color):
 
                         if has_time and ongoing and board.turn == color:
                             if leaving_square != arriving_square and arriving_square is not None:
-                                move = chess.Move.from_uci(leaving_square + arriving_square)
+                                move = chess.Move(leaving_square, arriving_square)
                                 promotion = promote_pawn(board, move, color)
 
                                 if promotion is not None:
-                                    move = chess.Move.from_uci(leaving_square + arriving_square + str(promotion).lower())
+                                    move = chess.Move(leaving_square, arriving_square,
+                                                      chess.Piece.from_symbol(promotion).piece_type)
 
                                 # Vérifiez si le coup est légal
                                 board = try_move(board, move, color)
@@ -1340,12 +1452,18 @@ def play_as(board, color):
                                 leaving_square = None
                                 second_click = False
 
+                if event.type == pygame.MOUSEWHEEL:
+                    # Défilement de l'historique des coups
+                    if hit_test(pygame.mouse.get_pos())[0] == "move_list":
+                        scroll_move_list(board, event.y)
+
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE or event.key == 113:
                         has_time = run = False
 
                     if event.key == 97:  # a key
                         # Abandon
+                        search = cancel_search(search)
                         has_resigned = True
                         ongoing, white_score, black_score = resign(ongoing, color, white_score, black_score)
                         board.push(chess.Move.null())  # Ajout du coup null pour signifier la fin de partie
@@ -1364,7 +1482,8 @@ def play_as(board, color):
 
                     if event.key == 106 and not ongoing:  # j key
                         # Nouvelle partie
-                        remaining_timeW = remaining_timeB = initial_time
+                        search = cancel_search(search)
+                        game_clock.reset(initial_time)
                         board = chess.Board()
                         lance = False
                         has_resigned = False
@@ -1372,10 +1491,23 @@ def play_as(board, color):
                         leaving_square = arriving_square = selected_square = None
                         selected = second_click = False
 
+                    if event.key == 115:  # s key
+                        # Affichage des statistiques de recherche de l'ordinateur
+                        display_search_stats = not display_search_stats
+
                     if event.key == 117:  # u key
-                        if board.move_stack.__len__() > 1:
+                        search = cancel_search(search)
+                        if board.turn == opposing_color and board.move_stack:
+                            # La machine n'a pas encore répondu : seul le coup de l'utilisateur est annulé
+                            board.pop()
+                            if ongoing:
+                                game_clock.take_back(color, increment)
+                        elif board.move_stack.__len__() > 1:
                             board.pop()  # Annulation du coup de la machine
                             board.pop()  # Annulation du coup de l'utilisateur
+                            if ongoing:
+                                game_clock.take_back(opposing_color, increment)
+                                game_clock.take_back(color, increment)
 
     except:
         print(format_exc(), file=stderr)
@@ -1387,6 +1519,11 @@ def play_as(board, color):
         bug_file.write('\n-----------------------------\n\n')
         bug_file.close()
 
+    finally:
+        # Fin du programme, y compris après une erreur : la recherche éventuelle de l'ordinateur est interrompue.
+        # Sans limite de temps, une recherche anticipée empêcherait sinon le programme de se terminer.
+        cancel_search(search)
+
 
 def play_random_color():
     # Fonction permettant à l'utilisateur de jouer aléatoirement les pièces blanches ou noires
@@ -1394,4 +1531,11 @@ def play_random_color():
     play_as(chess.Board(), color)
 
 
-play_random_color()
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chess game against the minimax AI")
+    parser.add_argument("--search-log", metavar="PATH",
+                        help="append the statistics of each search of the hard AI to this file (one JSON per line)")
+    search_log_path = parser.parse_args().search_log
+
+    SCREEN = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
+    play_random_color()
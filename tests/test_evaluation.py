@@ -0,0 +1,176 @@
+"""
+Tests d'équivalence de l'évaluation : les évaluations par bitboards (evaluate_board) et incrémentale
+(evaluate_incremental) doivent donner le même score que la fonction d'évaluation d'origine, figée ci-dessous.
+"""
+
+import chess
+import pytest
+
+import engine
+
+# Positions de référence (FEN) : roques, prises en passant et promotions
+POSITIONS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r1bqk2r/pppp1ppp/2n2n2/2b1p3/2B1P3/3P1N2/PPP2PPP/RNBQK2R w KQkq - 1 5",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R b Kq - 0 1",
+    "r4rk1/pp1bqppp/2n1pn2/3p4/3P4/2PBPN2/P2Q1PPP/2KR3R w - - 0 14",
+    "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+    "rnbqkbnr/pppp1ppp/8/8/3Pp3/8/PPP1PPPP/RNBQKBNR b KQkq d3 0 3",
+    "8/P1k5/8/8/8/8/5Kp1/8 w - - 0 1",
+    "1r2k3/P7/8/8/8/8/6p1/4K2R w K - 0 1",
+    "1r2k3/P7/8/8/8/8/6p1/4K2R b K - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3",
+]
+
+TOLERANCE = 1e-9  # Écart toléré, dû à l'ordre des additions des coefficients de développement (non entiers)
+
+# ---------------------------------------------- Évaluation d'origine ----------------------------------------------- #
+# Copie figée de l'évaluation case par case d'origine, qui sert de référence
+
+
+def reference_is_pawn_supported(board, square, color):
+    file, rank = chess.square_file(square), chess.square_rank(square)
+    adjacent_files = [file - 1, file + 1]
+
+    for adj_file in adjacent_files:
+        if adj_file in range(8):
+            adj_square = chess.square(adj_file, rank)
+            adj_piece = board.piece_at(adj_square)
+            if adj_piece is not None and adj_piece.piece_type == chess.PAWN and adj_piece.color == color:
+                return True
+
+    return False
+
+
+def reference_evaluate_board(board, color):
+    center_squares = [
+        chess.C4, chess.D4, chess.E4, chess.C5, chess.D5, chess.E5
+    ]
+
+    total_score = 0
+
+    values = engine.PIECES_VALUES
+    coeff = engine.development_coefficients
+
+    squares_pieces = (board.pieces(chess.PAWN, color) | board.pieces(chess.KNIGHT, color) |
+                      board.pieces(chess.BISHOP, color) | board.pieces(chess.ROOK, color) |
+                      board.pieces(chess.QUEEN, color) | board.pieces(chess.KING, color))
+
+    for square in squares_pieces:
+        piece = board.piece_at(square)
+
+        if piece is not None:
+            piece_value = values.get(piece.piece_type, 0)
+
+            if (color == chess.WHITE and square < 16) or (color == chess.BLACK and square > 47):
+                if piece.piece_type == chess.KING:
+                    piece_value -= 1
+
+                    if board.has_kingside_castling_rights(color) or board.has_queenside_castling_rights(color):
+                        piece_value += 1
+                else:
+                    piece_value += coeff[piece.piece_type] * (7 - chess.square_rank(square))
+
+            if piece.piece_type == chess.PAWN:
+                if not reference_is_pawn_supported(board, square, color):
+                    piece_value -= 1
+                if reference_is_pawn_supported(board, square, color):
+                    piece_value += 1
+
+            if piece.color == color:
+                total_score += piece_value
+            else:
+                total_score -= piece_value
+
+    center_control = 0
+    for square in center_squares:
+        if board.piece_at(square) is not None and board.piece_at(square).color == color:
+            center_control += 1
+        else:
+            center_control -= 1
+
+    total_score += center_control
+
+    king_safety = 0
+    king_square = board.king(color)
+
+    if not board.is_attacked_by(color, king_square):
+        king_safety += 1
+    else:
+        king_safety -= 1
+
+    total_score += king_safety
+
+    return total_score
+
+
+# ----------------------------------------------------- Corpus ------------------------------------------------------ #
+def corpus():
+    # Positions de référence et toutes les positions atteintes en un coup (dont les roques, prises en passant et
+    # promotions possibles)
+    boards = []
+    for fen in POSITIONS:
+        board = chess.Board(fen)
+        boards.append(board)
+        for move in board.legal_moves:
+            child = board.copy(stack=False)
+            child.push(move)
+            boards.append(child)
+    return boards
+
+
+def apply_move(board, move, color, state):
+    # Fonction jouant un coup et renvoyant les scores incrémentaux mis à jour, comme dans minimax_alpha_beta
+    piece_square, pawn_structure = state
+    delta, pawns_changed = engine.move_eval_delta(board, move, color)
+    board.push(move)
+    return piece_square + delta, engine.pawn_structure_score(board, color) if pawns_changed else pawn_structure
+
+
+# ------------------------------------------------------ Tests ------------------------------------------------------ #
+def test_corpus_covers_special_moves():
+    boards = [chess.Board(fen) for fen in POSITIONS]
+    moves = [(board, move) for board in boards for move in board.legal_moves]
+    assert any(board.is_castling(move) for board, move in moves)
+    assert any(board.is_en_passant(move) for board, move in moves)
+    assert any(move.promotion and board.is_capture(move) for board, move in moves)
+    assert any(move.promotion and not board.is_capture(move) for board, move in moves)
+
+
+@pytest.mark.parametrize("color", chess.COLORS)
+def test_evaluate_board_matches_reference(color):
+    for board in corpus():
+        assert engine.evaluate_board(board, color) == pytest.approx(reference_evaluate_board(board, color),
+                                                                   abs=TOLERANCE), board.fen()
+
+
+@pytest.mark.parametrize("color", chess.COLORS)
+def test_is_pawn_supported_matches_reference(color):
+    for board in corpus():
+        for square in board.pieces(chess.PAWN, color):
+            assert (engine.is_pawn_supported(board, square, color)
+                    == reference_is_pawn_supported(board, square, color)), (board.fen(), chess.square_name(square))
+
+
+@pytest.mark.parametrize("color", chess.COLORS)
+def test_evaluate_incremental_matches_reference(color):
+    # Les scores sont mis à jour coup par coup sur deux demi-coups, comme pendant la recherche
+    for fen in POSITIONS:
+        board = chess.Board(fen)
+        root_state = engine.piece_square_score(board, color), engine.pawn_structure_score(board, color)
+
+        for move in list(board.legal_moves):
+            state = apply_move(board, move, color, root_state)
+            assert engine.evaluate_incremental(board, color, *state) == pytest.approx(
+                reference_evaluate_board(board, color), abs=TOLERANCE), board.fen()
+
+            for reply in list(board.legal_moves):
+                reply_state = apply_move(board, reply, color, state)
+                assert engine.evaluate_incremental(board, color, *reply_state) == pytest.approx(
+                    reference_evaluate_board(board, color), abs=TOLERANCE), board.fen()
+                board.pop()
+
+            board.pop()
+
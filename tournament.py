@@ -0,0 +1,231 @@
+"""
+Tournoi sans interface graphique entre les intelligences artificielles du jeu, réparti sur plusieurs processus.
+Chaque couple de joueurs se rencontre sur chaque ouverture avec les deux couleurs. Les parties sont écrites au
+format PGN au fur et à mesure qu'elles se terminent, puis un tableau des scores et des différences d'Elo est affiché.
+
+    python tournament.py --players random minimax:2 minimax:3 --rounds 10 --pgn games.pgn
+    python tournament.py --players minimax:3 minimax:20@0.2 --openings openings.txt --workers 8
+
+Joueurs : « random » (coups aléatoires), « minimax:<profondeur> » (profondeur fixe) et
+« minimax:<profondeur>@<secondes> » (temps de réflexion par coup).
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import chess
+import chess.pgn
+
+import engine
+
+# Positions de départ par défaut : position initiale et quelques ouvertures courantes
+DEFAULT_OPENINGS = [
+    chess.STARTING_FEN,
+    "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2",  # 1. e4 e5
+    "rnbqkbnr/pp1ppppp/8/2p5/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2",  # Sicilienne
+    "rnbqkbnr/pppp1ppp/4p3/8/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2",  # Française
+    "rnbqkbnr/ppp1pppp/8/3p4/3P4/8/PPP1PPPP/RNBQKBNR w KQkq - 0 2",  # 1. d4 d5
+    "rnbqkb1r/pppppppp/5n2/8/3P4/8/PPP1PPPP/RNBQKBNR w KQkq - 1 2",  # 1. d4 Cf6
+    "rnbqkbnr/pppppppp/8/8/2P5/8/PP1PPPPP/RNBQKBNR b KQkq - 0 1",  # Anglaise
+    "rnbqkbnr/pppppppp/8/8/8/5N2/PPPPPPPP/RNBQKB1R b KQkq - 1 1",  # Réti
+]
+
+MAX_GAME_PLIES = 300  # Au-delà, la partie est arbitrée nulle
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # Les fichiers du moteur sont cherchés à côté de ce script
+
+
+def parse_player(spec):
+    """
+    Fonction lisant la description d'un joueur
+    :param spec: « random », « minimax:<profondeur> » ou « minimax:<profondeur>@<secondes> »
+    :return: Tuple (description, type, profondeur, temps de réflexion)
+    """
+    if spec == "random":
+        return spec, "random", 0, None
+
+    kind, _, limits = spec.partition(":")
+    if kind != "minimax" or not limits:
+        raise ValueError("unknown player %r (expected random, minimax:<depth> or minimax:<depth>@<seconds>)" % spec)
+    depth, _, time_limit = limits.partition("@")
+    return spec, kind, int(depth), float(time_limit) if time_limit else None
+
+
+def play_move(board, player):
+    """
+    Fonction déterminant le coup d'un joueur
+    :param board: État actuel de l'échiquier
+    :param player: Joueur renvoyé par parse_player
+    :return: Coup joué
+    """
+    _, kind, depth, time_limit = player
+    if kind == "random":
+        return random.choice(list(board.legal_moves))
+    _, move, _ = engine.find_best_move(board, depth, board.turn, time_limit)
+    return move
+
+
+def play_game(game_id, round_name, white, black, fen, opening_book=False):
+    """
+    Fonction jouant une partie complète entre deux joueurs (exécutée dans un processus du tournoi)
+    :param game_id: Numéro de la partie (sert aussi de graine aléatoire pour rendre la partie reproductible)
+    :param round_name: Ronde de la partie au format PGN « <ronde>.<partie> »
+    :param white: Joueur des blancs
+    :param black: Joueur des noirs
+    :param fen: Position de départ
+    :param opening_book: Consultation de la bibliothèque d'ouvertures par les joueurs minimax
+    :return: Tuple (numéro de la partie, joueur blanc, joueur noir, résultat, partie au format PGN, nombre de nœuds)
+    """
+    random.seed(game_id)
+    engine.OPENING_BOOK = opening_book
+    engine.OPENING_BOOK_PATH = os.path.join(BASE_DIR, engine.OPENING_BOOK_PATH)
+    engine.SYZYGY_PATH = os.path.join(BASE_DIR, engine.SYZYGY_PATH)
+    engine.SEARCH_WORKERS = 1  # Le tournoi est déjà réparti sur plusieurs processus
+    engine.TRANSPOSITION_TABLE.clear()
+    engine.clear_move_ordering()
+
+    board = chess.Board(fen)
+    players = {chess.WHITE: white, chess.BLACK: black}
+    nodes = 0
+
+    while not board.is_game_over(claim_draw=True) and board.ply() < MAX_GAME_PLIES:
+        board.push(play_move(board, players[board.turn]))
+        if players[not board.turn][1] == "minimax":
+            nodes += engine.search_stats.nodes
+
+    result = board.result(claim_draw=True)
+    if result == "*":  # Limite de demi-coups atteinte
+        result = "1/2-1/2"
+
+    game = chess.pgn.Game.from_board(board)
+    game.headers["Event"] = "Self-play tournament"
+    game.headers["Round"] = round_name
+    game.headers["White"] = white[0]
+    game.headers["Black"] = black[0]
+    game.headers["Result"] = result
+
+    return game_id, white[0], black[0], result, str(game), nodes
+
+
+# ---------------------------------------------------- Résultats ---------------------------------------------------- #
+def elo_difference(score):
+    # Fonction convertissant un score moyen (entre 0 et 1) en différence d'Elo
+    score = min(max(score, 1e-3), 1 - 1e-3)
+    return -400 * math.log10(1 / score - 1)
+
+
+def elo_error_margin(wins, draws, losses):
+    """
+    Fonction calculant la marge d'erreur (intervalle de confiance à 95 %) d'une différence d'Elo
+    :param wins: Nombre de victoires
+    :param draws: Nombre de nulles
+    :param losses: Nombre de défaites
+    :return: Marge d'erreur en points Elo
+    """
+    games = wins + draws + losses
+    score = (wins + draws / 2) / games
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    if variance == 0:
+        return float('inf')
+    low, high = score - 1.96 * math.sqrt(variance / games), score + 1.96 * math.sqrt(variance / games)
+    return (elo_difference(high) - elo_difference(low)) / 2
+
+
+def print_table(standings, file=sys.stdout):
+    """
+    Fonction affichant le tableau des scores : chaque joueur est comparé à l'ensemble de ses adversaires
+    :param standings: Dictionnaire {joueur: [victoires, nulles, défaites]}
+    :param file: Fichier dans lequel le tableau est écrit
+    """
+    print("%-20s %6s %6s %6s %6s %7s %14s" % ("Player", "Games", "Wins", "Draws", "Losses", "Score", "Elo"),
+          file=file)
+    ranking = sorted(standings.items(), key=lambda item: item[1][0] + item[1][1] / 2, reverse=True)
+    for player, (wins, draws, losses) in ranking:
+        games = wins + draws + losses
+        score = (wins + draws / 2) / games
+        print("%-20s %6d %6d %6d %6d %6.1f%% %+6.0f ± %-5.0f"
+              % (player, games, wins, draws, losses, 100 * score, elo_difference(score),
+                 elo_error_margin(wins, draws, losses)), file=file)
+
+
+def main():
+    # Fonction lançant le tournoi depuis la ligne de commande
+    parser = argparse.ArgumentParser(description="Headless self-play tournament between the game AIs")
+    parser.add_argument("--players", nargs="+", default=["random", "minimax:2", "minimax:3"],
+                        help="players: random, minimax:<depth> or minimax:<depth>@<seconds> (default: %(default)s)")
+    parser.add_argument("--openings", help="file with one starting FEN per line (default: built-in openings)")
+    parser.add_argument("--rounds", type=int, default=1,
+                        help="times each pairing plays every opening with both colours (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="number of game processes (default: number of CPUs)")
+    parser.add_argument("--pgn", help="write the games to this PGN file (default: standard output)")
+    parser.add_argument("--book", action="store_true", help="let minimax players use the opening book")
+    args = parser.parse_args()
+
+    players = [parse_player(spec) for spec in args.players]
+    if args.openings:
+        with open(args.openings) as file:
+            openings = [line.strip() for line in file if line.strip() and not line.startswith("#")]
+    else:
+        openings = DEFAULT_OPENINGS
+
+    # À chaque ronde, chaque couple de joueurs joue chaque ouverture avec les deux couleurs
+    schedule = []
+    for round_number in range(1, args.rounds + 1):
+        pairings = []
+        for i, first in enumerate(players):
+            for second in players[i + 1:]:
+                for fen in openings:
+                    pairings.append((first, second, fen))
+                    pairings.append((second, first, fen))
+        schedule += [("%d.%d" % (round_number, game), white, black, fen)
+                     for game, (white, black, fen) in enumerate(pairings, 1)]
+
+    standings = {player[0]: [0, 0, 0] for player in players}
+    pgn_file = open(args.pgn, "w") if args.pgn else sys.stdout
+    start = time.monotonic()
+    total_nodes = 0
+
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futures = [executor.submit(play_game, game_id, round_name, white, black, fen, args.book)
+                       for game_id, (round_name, white, black, fen) in enumerate(schedule)]
+
+            # Les parties sont écrites dans l'ordre où elles se terminent
+            for done, future in enumerate(as_completed(futures), 1):
+                _, white, black, result, pgn, nodes = future.result()
+                pgn_file.write(pgn + "\n\n")
+                pgn_file.flush()
+                total_nodes += nodes
+
+                if result == "1-0":
+                    standings[white][0] += 1
+                    standings[black][2] += 1
+                elif result == "0-1":
+                    standings[white][2] += 1
+                    standings[black][0] += 1
+                else:
+                    standings[white][1] += 1
+                    standings[black][1] += 1
+
+                print("Game %d/%d: %s - %s %s" % (done, len(schedule), white, black, result), file=sys.stderr)
+    finally:
+        if pgn_file is not sys.stdout:
+            pgn_file.close()
+
+    # Le tableau ne doit pas se mêler aux parties si elles sont écrites sur la sortie standard
+    elapsed = time.monotonic() - start
+    output = sys.stderr if pgn_file is sys.stdout else sys.stdout
+    print(file=output)
+    print_table(standings, output)
+    print("\n%d games in %.1f s (%.0f games/hour, %d workers, %d nodes)"
+          % (len(schedule), elapsed, 3600 * len(schedule) / elapsed, args.workers, total_nodes), file=output)
+
+
+if __name__ == "__main__":
+    main()
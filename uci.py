@@ -0,0 +1,263 @@
+"""
+Interface UCI (Universal Chess Interface) du moteur minimax, sans interface graphique.
+Le moteur se lance avec « python uci.py » et dialogue sur l'entrée et la sortie standard : il peut être utilisé par
+les interfaces et outils de tournoi habituels (cutechess-cli, chess.engine.SimpleEngine.popen_uci, etc.).
+Commandes prises en charge : uci, isready, ucinewgame, setoption, position, go (depth, movetime, wtime, btime,
+winc, binc, infinite), stop et quit.
+"""
+
+import os
+import sys
+import time
+import threading
+
+import chess
+
+import engine
+
+ENGINE_NAME = "Chess-Game minimax"
+ENGINE_AUTHOR = "yanis-montgenie"
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # Les fichiers du moteur sont cherchés à côté de ce script
+
+output_lock = threading.Lock()  # Les lignes « info » et « bestmove » sont écrites depuis le fil de recherche
+
+search_thread = None  # Fil d'exécution de la recherche en cours
+search_stop = threading.Event()  # Événement signalant la commande « stop » à la recherche en cours
+
+
+def send(line):
+    # Fonction écrivant une ligne vers l'interface (la sortie est vidée immédiatement)
+    with output_lock:
+        sys.stdout.write(line + "\n")
+        sys.stdout.flush()
+
+
+# ----------------------------------------------------- Options ----------------------------------------------------- #
+def send_options():
+    # Fonction déclarant les options réglables du moteur
+    send("option name Hash type spin default %d min 1 max 4096" % engine.TT_SIZE_MB)
+    send("option name Threads type spin default %d min 1 max 64" % engine.SEARCH_WORKERS)
+    send("option name OwnBook type check default %s" % ("true" if engine.OPENING_BOOK else "false"))
+    send("option name SyzygyPath type string default %s" % engine.SYZYGY_PATH)
+
+
+def set_option(tokens):
+    """
+    Fonction appliquant une commande « setoption name <nom> value <valeur> »
+    :param tokens: Mots de la commande, sans « setoption »
+    """
+    if "name" not in tokens:
+        return
+    name_index = tokens.index("name") + 1
+    value_index = tokens.index("value") if "value" in tokens else len(tokens)
+    name = " ".join(tokens[name_index:value_index]).lower()
+    value = " ".join(tokens[value_index + 1:])
+
+    if name == "hash":
+        engine.TT_SIZE_MB = max(1, int(value))
+        engine.release_shared_table()
+        engine.TRANSPOSITION_TABLE = engine.TranspositionTable(engine.TT_SIZE_MB)
+    elif name == "threads":
+        engine.SEARCH_WORKERS = max(1, int(value))
+    elif name == "ownbook":
+        engine.OPENING_BOOK = value.lower() == "true"
+    elif name == "syzygypath":
+        # Les tables seront recensées à nouveau à la prochaine recherche
+        engine.SYZYGY_PATH = value
+        engine.tablebase = None
+        engine.tablebase_pieces = 0
+        engine.tablebase_checked = False
+    else:
+        send("info string unknown option %s" % name)
+
+
+# ---------------------------------------------------- Position ----------------------------------------------------- #
+def parse_position(tokens):
+    """
+    Fonction construisant l'échiquier décrit par une commande « position »
+    :param tokens: Mots de la commande, sans « position » (startpos ou fen <FEN>, puis éventuellement moves ...)
+    :return: Échiquier correspondant
+    """
+    moves_index = tokens.index("moves") if "moves" in tokens else len(tokens)
+
+    if tokens and tokens[0] == "fen":
+        board = chess.Board(" ".join(tokens[1:moves_index]))
+    else:
+        board = chess.Board()
+
+    for uci_move in tokens[moves_index + 1:]:
+        board.push_uci(uci_move)
+
+    return board
+
+
+# ---------------------------------------------------- Recherche ---------------------------------------------------- #
+def parse_go(tokens):
+    """
+    Fonction lisant les paramètres d'une commande « go »
+    :param tokens: Mots de la commande, sans « go »
+    :return: Dictionnaire des paramètres numériques (depth, movetime, wtime, btime, winc, binc) et l'indicateur
+             infinite
+    """
+    params = {"infinite": "infinite" in tokens}
+    for name in ("depth", "movetime", "wtime", "btime", "winc", "binc"):
+        if name in tokens:
+            params[name] = int(tokens[tokens.index(name) + 1])
+    return params
+
+
+def search_limits(board, params):
+    """
+    Fonction convertissant les paramètres d'une commande « go » en limites de recherche
+    :param board: Position à chercher
+    :param params: Paramètres renvoyés par parse_go
+    :return: Profondeur maximale et temps de réflexion en secondes (None pour une recherche sans limite de temps)
+    """
+    depth = min(params.get("depth", engine.MAX_SEARCH_DEPTH), engine.MAX_SEARCH_DEPTH)
+
+    if params["infinite"]:
+        return depth, None
+
+    if "movetime" in params:
+        return depth, max(params["movetime"] / 1000 - engine.MOVE_OVERHEAD, engine.MIN_MOVE_TIME)
+
+    # Cadence : même répartition du temps de la pendule que dans l'interface graphique
+    remaining = params.get("wtime" if board.turn == chess.WHITE else "btime")
+    if remaining is not None:
+        increment = params.get("winc" if board.turn == chess.WHITE else "binc", 0)
+        return depth, engine.allocate_move_time(remaining / 1000, increment / 1000)
+
+    return depth, None
+
+
+def format_score(value):
+    """
+    Fonction formant le score d'une ligne « info », du point de vue du joueur au trait.
+    L'évaluation du moteur ne compte que les pièces de l'ordinateur et n'est pas symétrique entre les deux camps :
+    elle ne peut pas être convertie en centièmes de pion. Seul un mat trouvé par la recherche est donc annoncé
+    :param value: Score renvoyé par la recherche
+    :return: « score mate <coups> » si la recherche a trouvé un mat, chaîne vide sinon
+    """
+    if value is None or abs(value) <= engine.MATE_SCORE - engine.MAX_PLY:
+        return ""
+    plies = engine.MATE_SCORE - abs(value)
+    return " score mate %d" % ((plies + 1) // 2 if value > 0 else -(plies // 2))
+
+
+def run_search(board, depth, time_limit, infinite, stop_event):
+    """
+    Fonction exécutée dans le fil de recherche : elle envoie une ligne « info » à la fin de chaque profondeur,
+    puis le meilleur coup
+    :param board: Position à chercher
+    :param depth: Profondeur maximale de recherche
+    :param time_limit: Temps de réflexion alloué en secondes (None pour une recherche sans limite de temps)
+    :param infinite: Le coup n'est envoyé qu'après la commande « stop », même si la recherche se termine avant
+    :param stop_event: Événement signalant la commande « stop »
+    """
+    start = time.monotonic()
+
+    def send_info(completed_depth, value, move):
+        # Aucun coup si la partie est déjà terminée dans la position cherchée
+        elapsed = max(time.monotonic() - start, 1e-6)
+        nodes = engine.search_stats.nodes
+        send("info depth %d%s nodes %d nps %d time %d%s"
+             % (completed_depth, format_score(value), nodes, nodes / elapsed, elapsed * 1000,
+                " pv " + move.uci() if move is not None else ""))
+
+    engine.search_stop = stop_event
+    try:
+        value, best_move, _ = engine.find_best_move(board, depth, board.turn, time_limit, on_depth=send_info)
+    finally:
+        engine.search_stop = threading.Event()
+        engine.search_deadline = None
+
+    if value is None and best_move is not None:
+        send("info string move from opening book or tablebase")
+
+    # Recherche arrêtée avant la fin de la profondeur 1 : on joue le coup le mieux ordonné
+    if best_move is None and not board.is_game_over():
+        best_move = engine.order_moves(board, list(board.legal_moves), None, 0)[0]
+
+    if infinite:
+        stop_event.wait()
+
+    send("bestmove %s" % (best_move.uci() if best_move is not None else "0000"))
+
+
+def start_search(board, params):
+    """
+    Fonction lançant la recherche d'une commande « go » dans un fil dédié, l'entrée standard restant lue
+    :param board: Position à chercher
+    :param params: Paramètres renvoyés par parse_go
+    """
+    global search_thread, search_stop
+
+    depth, time_limit = search_limits(board, params)
+    infinite = params["infinite"] or (time_limit is None and "depth" not in params)
+
+    search_stop = threading.Event()
+    search_thread = threading.Thread(target=run_search, args=(board.copy(), depth, time_limit, infinite, search_stop),
+                                     name="uci-search", daemon=True)
+    search_thread.start()
+
+
+def stop_search():
+    # Fonction arrêtant la recherche en cours et attendant l'envoi de son meilleur coup
+    global search_thread
+
+    if search_thread is not None:
+        search_stop.set()
+        search_thread.join()
+        search_thread = None
+
+
+# ------------------------------------------------ Boucle principale ------------------------------------------------ #
+def main():
+    # Fonction lisant les commandes de l'interface sur l'entrée standard jusqu'à « quit »
+    engine.OPENING_BOOK_PATH = os.path.join(BASE_DIR, engine.OPENING_BOOK_PATH)
+    engine.SYZYGY_PATH = os.path.join(BASE_DIR, engine.SYZYGY_PATH)
+
+    board = chess.Board()
+
+    for line in sys.stdin:
+        tokens = line.split()
+        if not tokens:
+            continue
+        command, tokens = tokens[0], tokens[1:]
+
+        if command == "uci":
+            send("id name %s" % ENGINE_NAME)
+            send("id author %s" % ENGINE_AUTHOR)
+            send_options()
+            send("uciok")
+        elif command == "isready":
+            send("readyok")
+        elif command == "setoption":
+            stop_search()
+            set_option(tokens)
+            # Les processus de la recherche parallèle sont démarrés dès le réglage, et non pendant le premier coup
+            if engine.SEARCH_WORKERS > 1:
+                engine.start_search_pool()
+        elif command == "ucinewgame":
+            stop_search()
+            engine.TRANSPOSITION_TABLE.clear()
+            engine.clear_move_ordering()
+            board = chess.Board()
+        elif command == "position":
+            stop_search()
+            board = parse_position(tokens)
+        elif command == "go":
+            stop_search()
+            start_search(board, parse_go(tokens))
+        elif command == "stop":
+            stop_search()
+        elif command == "quit":
+            break
+        # Les commandes inconnues sont ignorées, comme le prévoit le protocole
+
+    stop_search()
+
+
+if __name__ == "__main__":
+    main()